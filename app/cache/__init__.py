@@ -0,0 +1,39 @@
+from .task_counter import (
+    get_task_count,
+    prime_task_count,
+    adjust_task_count,
+    drop_task_count,
+    scan_task_counts,
+    repair_task_count
+)
+from .task_cache import (
+    get_cached_task,
+    cache_task,
+    invalidate_tasks
+)
+from .generation import (
+    get_generation,
+    bump_generation
+)
+from .page_cache import (
+    get_page,
+    store_page
+)
+from .recent_writes import (
+    mark_recent_write,
+    has_recent_write
+)
+from .task_events import (
+    publish_task_events,
+    TaskEventSubscription
+)
+from .revoked_users import (
+    revoke_user_tokens,
+    is_user_revoked
+)
+from .reminders import (
+    schedule_reminders,
+    cancel_reminders,
+    pop_due_reminders,
+    restore_reminders
+)
@@ -0,0 +1,65 @@
+from app.redis_client import redis_session
+from loguru import logger
+from uuid import UUID
+from typing import Optional
+import time
+
+# Refreshed on every bump, an idle user's generation simply expires
+GENERATION_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# A missing generation restarts from the clock instead of 1: values handed
+# out before an eviction can never come back and revive stale entries
+_GET_OR_INIT = """
+local value = redis.call('GET', KEYS[1])
+if not value then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return ARGV[1]
+end
+return value
+"""
+
+_BUMP = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    local value = redis.call('INCR', KEYS[1])
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    return value
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return ARGV[1]
+"""
+
+
+def _generation_key(namespace: str, user_id: UUID) -> str:
+    return f"{namespace}_gen:{user_id}"
+
+
+async def get_generation(namespace: str, user_id: UUID) -> Optional[str]:
+    """Current data version of the user, None if Redis is unavailable."""
+    try:
+        async with redis_session() as session:
+            value = await session.eval(
+                _GET_OR_INIT, 1, _generation_key(namespace, user_id),
+                time.time_ns(), GENERATION_TTL_SECONDS
+            )
+        return str(value)
+    except Exception as error:
+        logger.error(f"Failed to read {namespace} generation of user {user_id}: {error}")
+        return None
+
+
+async def bump_generation(namespace: str, user_id: UUID) -> None:
+    try:
+        async with redis_session() as session:
+            await session.eval(
+                _BUMP, 1, _generation_key(namespace, user_id),
+                time.time_ns(), GENERATION_TTL_SECONDS
+            )
+    except Exception as error:
+        # Without a bump cached entries would outlive the write, drop the
+        # generation so the next read starts a fresh one from the clock
+        logger.error(f"Failed to bump {namespace} generation of user {user_id}: {error}")
+        try:
+            async with redis_session() as session:
+                await session.delete(_generation_key(namespace, user_id))
+        except Exception as delete_error:
+            logger.error(f"Failed to drop {namespace} generation of user {user_id}: {delete_error}")
@@ -0,0 +1,37 @@
+from app.redis_client import redis_session
+from loguru import logger
+from uuid import UUID
+from typing import Optional
+import hashlib
+import json
+
+# Pages are also unreachable as soon as the generation moves on,
+# the TTL only reclaims memory of abandoned generations
+PAGE_CACHE_TTL_SECONDS = 120
+
+
+def _page_key(user_id: UUID, generation: str, params: dict) -> str:
+    digest = hashlib.sha1(
+        json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"task_page:{user_id}:{generation}:{digest}"
+
+
+async def get_page(user_id: UUID, generation: str, params: dict) -> Optional[str]:
+    """Serialized page body built under `generation`, None on a miss."""
+    try:
+        async with redis_session() as session:
+            return await session.get(_page_key(user_id, generation, params))
+    except Exception as error:
+        logger.error(f"Failed to read cached task page of user {user_id}: {error}")
+        return None
+
+
+async def store_page(user_id: UUID, generation: str, params: dict, body: str) -> None:
+    try:
+        async with redis_session() as session:
+            await session.set(
+                _page_key(user_id, generation, params), body, ex=PAGE_CACHE_TTL_SECONDS
+            )
+    except Exception as error:
+        logger.error(f"Failed to cache task page of user {user_id}: {error}")
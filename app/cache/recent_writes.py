@@ -0,0 +1,37 @@
+from app.redis_client import redis_session
+from app.config.config import POSTGRESQL_CONFIG
+from loguru import logger
+from uuid import UUID
+
+
+def _recent_write_key(user_id: UUID) -> str:
+    return f"recent_write:{user_id}"
+
+
+async def mark_recent_write(user_id: UUID) -> None:
+    """
+    Pins the reads of the user to the primary for the replication window,
+    so they see their own write. Nothing to do without replicas.
+    """
+    if not POSTGRESQL_CONFIG.replica_urls:
+        return
+    try:
+        async with redis_session() as session:
+            await session.set(
+                _recent_write_key(user_id),
+                1,
+                ex=POSTGRESQL_CONFIG.read_your_writes_seconds
+            )
+    except Exception as error:
+        logger.error(f"Failed to mark recent write of user {user_id}: {error}")
+
+
+async def has_recent_write(user_id: UUID) -> bool:
+    """True while the user's last write may not have reached the replicas."""
+    try:
+        async with redis_session() as session:
+            return bool(await session.exists(_recent_write_key(user_id)))
+    except Exception as error:
+        # Unknown is treated as recent, the primary is always up to date
+        logger.error(f"Failed to check recent write of user {user_id}: {error}")
+        return True
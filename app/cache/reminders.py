@@ -0,0 +1,81 @@
+from app.redis_client import redis_session
+from app.config.config import REMINDER_CONFIG
+from loguru import logger
+from uuid import UUID
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple    # noqa: TYP001
+
+# One sorted set for every user: member task_id, score the epoch second the
+# reminder is due. ZADD and the pop below are O(log n) in the set size
+REMINDERS_KEY = "reminders:due"
+
+# The due members are the lowest ranked ones, so removing them by rank is
+# exact; the script makes reading and removing atomic between workers
+_POP_DUE = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, ARGV[2])
+if #due > 0 then
+    redis.call('ZREMRANGEBYRANK', KEYS[1], 0, #due / 2 - 1)
+end
+return due
+"""
+
+
+def reminder_lead() -> timedelta:
+    return timedelta(minutes=REMINDER_CONFIG.lead_minutes)
+
+
+async def schedule_reminders(due: Mapping[UUID, Optional[datetime]]) -> None:
+    """
+    Sets the due time of each task, replacing any previous one. Tasks without
+    a due time, or already past it, are unscheduled.
+    """
+    if not due:
+        return
+    now = datetime.now(timezone.utc)
+    scores = {
+        str(task_id): (appointed_at - reminder_lead()).timestamp()
+        for task_id, appointed_at in due.items()
+        if appointed_at is not None and appointed_at > now
+    }
+    unscheduled = [str(task_id) for task_id in due if str(task_id) not in scores]
+    try:
+        async with redis_session() as session:
+            async with session.pipeline(transaction=False) as pipe:
+                if scores:
+                    pipe.zadd(REMINDERS_KEY, scores)
+                if unscheduled:
+                    pipe.zrem(REMINDERS_KEY, *unscheduled)
+                await pipe.execute()
+    except Exception as error:
+        logger.error(f"Failed to schedule reminders of {len(due)} tasks: {error}")
+
+
+async def cancel_reminders(task_ids: Sequence[UUID]) -> None:
+    if not task_ids:
+        return
+    try:
+        async with redis_session() as session:
+            await session.zrem(REMINDERS_KEY, *(str(task_id) for task_id in task_ids))
+    except Exception as error:
+        # A stale entry only costs a lookup: dispatch skips tasks that are gone
+        logger.error(f"Failed to cancel reminders of {len(task_ids)} tasks: {error}")
+
+
+async def pop_due_reminders(now: datetime, limit: int) -> List[Tuple[UUID, float]]:
+    """Removes and returns up to `limit` reminders due by `now` as (task_id, score). Errors are left to the caller."""
+    async with redis_session() as session:
+        due = await session.eval(_POP_DUE, 1, REMINDERS_KEY, now.timestamp(), limit)
+    return [(UUID(member), float(score)) for member, score in zip(due[::2], due[1::2])]
+
+
+async def restore_reminders(popped: Sequence[Tuple[UUID, float]]) -> None:
+    """Puts back reminders that could not be dispatched, unless rescheduled meanwhile."""
+    if not popped:
+        return
+    try:
+        async with redis_session() as session:
+            await session.zadd(
+                REMINDERS_KEY, {str(task_id): score for task_id, score in popped}, nx=True
+            )
+    except Exception as error:
+        logger.error(f"Failed to restore {len(popped)} reminders: {error}")
@@ -0,0 +1,31 @@
+from app.redis_client import redis_session
+from app.config.config import JWT_CONFIG
+from loguru import logger
+from uuid import UUID
+
+
+def _revoked_key(user_id: UUID) -> str:
+    return f"revoked_user:{user_id}"
+
+
+async def revoke_user_tokens(user_id: UUID) -> None:
+    """
+    Rejects every token already issued to the user. Kept as long as the
+    longest token lives; no new one is issued to a deleted account.
+    """
+    try:
+        async with redis_session() as session:
+            await session.set(_revoked_key(user_id), 1, ex=JWT_CONFIG.expiration_time * 60)
+    except Exception as error:
+        logger.error(f"Failed to revoke tokens of user {user_id}: {error}")
+
+
+async def is_user_revoked(user_id: UUID) -> bool:
+    try:
+        async with redis_session() as session:
+            return bool(await session.exists(_revoked_key(user_id)))
+    except Exception as error:
+        # Not an outage of every endpoint: deleted accounts are still
+        # filtered by the writes that matter (see app/database/user.py)
+        logger.error(f"Failed to check revocation of user {user_id}: {error}")
+        return False
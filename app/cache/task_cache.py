@@ -0,0 +1,54 @@
+from app.redis_client import redis_session
+from loguru import logger
+from uuid import UUID
+from typing import Optional, Iterable
+
+# Short enough that a fill racing with an invalidation is not served for long
+TASK_CACHE_TTL_SECONDS = 300
+
+
+def _task_key(user_id: UUID, task_id: UUID) -> str:
+    # Namespaced by owner, a user can never hit another user's entry
+    return f"task:{user_id}:{task_id}"
+
+
+async def get_cached_task(user_id: UUID, task_id: UUID, etag: str) -> Optional[str]:
+    """
+    Serialized task body, returned to the client as is. Only a body cached
+    under `etag` is returned: a fill that raced with a write (e.g. from a
+    lagging replica) carries the ETag read before it and is never served
+    under a newer one.
+    """
+    try:
+        async with redis_session() as session:
+            value = await session.get(_task_key(user_id, task_id))
+    except Exception as error:
+        logger.error(f"Failed to read cached task {task_id}: {error}")
+        return None
+    if value is None:
+        return None
+    cached_etag, _, body = value.partition("\n")
+    return body if cached_etag == etag else None
+
+
+async def cache_task(user_id: UUID, task_id: UUID, etag: str, body: str) -> None:
+    try:
+        async with redis_session() as session:
+            await session.set(
+                _task_key(user_id, task_id),
+                f"{etag}\n{body}",
+                ex=TASK_CACHE_TTL_SECONDS
+            )
+    except Exception as error:
+        logger.error(f"Failed to cache task {task_id}: {error}")
+
+
+async def invalidate_tasks(user_id: UUID, task_ids: Iterable[UUID]) -> None:
+    keys = [_task_key(user_id, task_id) for task_id in task_ids]
+    if not keys:
+        return
+    try:
+        async with redis_session() as session:
+            await session.delete(*keys)
+    except Exception as error:
+        logger.error(f"Failed to invalidate cached tasks of user {user_id}: {error}")
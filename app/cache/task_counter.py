@@ -0,0 +1,106 @@
+from app.redis_client import redis_session
+from loguru import logger
+from uuid import UUID
+from typing import Optional, Dict, List, AsyncIterator    # noqa: TYP001
+
+# Counters are a cache of `SELECT count(*)`: the TTL bounds how long
+# any drift can survive even if the reconciliation job is not running
+COUNTER_TTL_SECONDS = 24 * 60 * 60
+
+# INCRBY only when the counter is already primed, otherwise a fresh key
+# would start from the delta instead of the real number of tasks
+_INCR_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+_COMPARE_AND_SET = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+def _counter_key(user_id: UUID) -> str:
+    return f"task_count:{user_id}"
+
+
+async def get_task_count(user_id: UUID) -> Optional[int]:
+    try:
+        async with redis_session() as session:
+            value = await session.get(_counter_key(user_id))
+        return int(value) if value is not None else None
+    except Exception as error:
+        logger.error(f"Failed to read task counter of user {user_id}: {error}")
+        return None
+
+
+async def prime_task_count(user_id: UUID, count: int) -> None:
+    """Stores a freshly computed count unless a writer primed it first."""
+    try:
+        async with redis_session() as session:
+            await session.set(
+                _counter_key(user_id), count, ex=COUNTER_TTL_SECONDS, nx=True
+            )
+    except Exception as error:
+        logger.error(f"Failed to prime task counter of user {user_id}: {error}")
+
+
+async def adjust_task_count(user_id: UUID, delta: int) -> None:
+    if not delta:
+        return
+    try:
+        async with redis_session() as session:
+            await session.eval(_INCR_IF_EXISTS, 1, _counter_key(user_id), delta)
+    except Exception as error:
+        # Leave the counter to the TTL rather than serving a wrong number
+        logger.error(f"Failed to adjust task counter of user {user_id}: {error}")
+        await drop_task_count(user_id)
+
+
+async def drop_task_count(user_id: UUID) -> None:
+    try:
+        async with redis_session() as session:
+            await session.delete(_counter_key(user_id))
+    except Exception as error:
+        logger.error(f"Failed to drop task counter of user {user_id}: {error}")
+
+
+async def scan_task_counts(batch_size: int = 500) -> AsyncIterator[Dict[UUID, int]]:
+    """Yields batches of primed counters as {user_id: cached_count}."""
+    async with redis_session() as session:
+        keys = []
+        async for key in session.scan_iter(match=_counter_key("*"), count=batch_size):
+            keys.append(key)
+            if len(keys) >= batch_size:
+                yield await _read_counters(session, keys)
+                keys = []
+        if keys:
+            yield await _read_counters(session, keys)
+
+
+async def _read_counters(session, keys: List[str]) -> Dict[UUID, int]:
+    values = await session.mget(keys)
+    return {
+        UUID(key.split(":", 1)[1]): int(value)
+        for key, value in zip(keys, values)
+        if value is not None
+    }
+
+
+async def repair_task_count(user_id: UUID, cached: int, actual: int) -> bool:
+    """
+    Replaces a drifted counter with the count from Postgres.
+    The swap only happens if nobody touched the counter since `cached` was read,
+    so a concurrent create/remove is never overwritten by an older count.
+    """
+    async with redis_session() as session:
+        repaired = await session.eval(
+            _COMPARE_AND_SET, 1, _counter_key(user_id),
+            cached, actual, COUNTER_TTL_SECONDS
+        )
+    return bool(repaired)
@@ -0,0 +1,168 @@
+from app.redis_client import redis_session
+from loguru import logger
+from uuid import UUID
+from typing import Dict, Optional, Sequence, Set, Union    # noqa: TYP001
+import asyncio
+import orjson
+
+# Sentinels handed out by TaskEventSubscription.get next to event payloads
+RESYNC = object()
+CLOSED = object()
+
+
+def _events_channel(user_id: UUID) -> str:
+    return f"tasks:events:{user_id}"
+
+
+async def publish_task_events(
+    user_id: UUID,
+    created: Sequence[UUID] = (),
+    updated: Sequence[UUID] = (),
+    deleted: Sequence[UUID] = ()
+) -> None:
+    """One message per committed write, however many tasks it touched."""
+    payload = {
+        # Ids come from RETURNING as asyncpg's UUID subclass, which orjson refuses
+        kind: [str(task_id) for task_id in task_ids]
+        for kind, task_ids in (("created", created), ("updated", updated), ("deleted", deleted))
+        if task_ids
+    }
+    if not payload:
+        return
+    try:
+        async with redis_session() as session:
+            await session.publish(_events_channel(user_id), orjson.dumps(payload))
+    except Exception as error:
+        logger.error(f"Failed to publish task events of user {user_id}: {error}")
+
+
+class _SharedSubscriber:
+    """
+    The one Redis pub/sub connection of the process. A user's channel is
+    subscribed while at least one local stream watches it, and each message
+    is handed to the buffers of those streams: Redis connections stay at one
+    however many streams are open, and at none while no stream is.
+    """
+
+    def __init__(self):
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._streams: Dict[str, Set["TaskEventSubscription"]] = {}
+        # Orders (UN)SUBSCRIBE commands and the reset after a lost connection
+        self._lock = asyncio.Lock()
+
+    async def add(self, stream: "TaskEventSubscription") -> None:
+        async with self._lock:
+            if self._pubsub is None:
+                async with redis_session() as session:
+                    self._pubsub = session.pubsub(ignore_subscribe_messages=True)
+            streams = self._streams.setdefault(stream.channel, set())
+            if not streams:
+                try:
+                    await self._pubsub.subscribe(stream.channel)
+                except Exception:
+                    del self._streams[stream.channel]
+                    raise
+            streams.add(stream)
+            if self._reader is None:
+                self._reader = asyncio.create_task(self._read())
+
+    async def remove(self, stream: "TaskEventSubscription") -> None:
+        async with self._lock:
+            streams = self._streams.get(stream.channel)
+            if streams is None or stream not in streams:
+                return
+            streams.discard(stream)
+            if streams:
+                return
+            del self._streams[stream.channel]
+            if not self._streams:
+                await self._close()
+                return
+            try:
+                await self._pubsub.unsubscribe(stream.channel)
+            except Exception as error:
+                logger.warning(f"Failed to unsubscribe from {stream.channel}: {error}")
+
+    async def _close(self) -> None:
+        """Stops reading and drops the connection, the next add() starts afresh. Runs under the lock."""
+        reader, pubsub = self._reader, self._pubsub
+        self._reader, self._pubsub = None, None
+        reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
+        try:
+            await pubsub.aclose()
+        except Exception as error:
+            logger.warning(f"Failed to close the shared task event subscription: {error}")
+
+    def _dispatch(self, message: dict) -> None:
+        if message["type"] != "message":
+            return
+        for stream in tuple(self._streams.get(message["channel"], ())):
+            stream._push(message["data"])
+
+    async def _read(self) -> None:
+        try:
+            while True:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    self._dispatch(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            logger.error(f"Shared task event subscription lost: {error}")
+        await self._reset()
+
+    async def _reset(self) -> None:
+        """Ends every stream with CLOSED, the next subscription connects afresh."""
+        async with self._lock:
+            pubsub, streams = self._pubsub, self._streams
+            self._pubsub, self._streams, self._reader = None, {}, None
+        for channel_streams in streams.values():
+            for stream in channel_streams:
+                stream._push(CLOSED)
+        try:
+            await pubsub.aclose()
+        except Exception as error:
+            logger.warning(f"Failed to close the shared task event subscription: {error}")
+
+
+_subscriber = _SharedSubscriber()
+
+
+class TaskEventSubscription:
+    """
+    Subscription of one stream to the events of one user, served by the
+    shared subscriber of the process, which drains Redis at once (a lagging
+    pub/sub client would be cut off by Redis) into a buffer of `max_buffered`
+    events per stream. A consumer that falls that far behind loses the
+    buffered events and gets RESYNC instead: it has to reload the list,
+    which beats an unbounded buffer.
+    """
+
+    def __init__(self, user_id: UUID, max_buffered: int = 100):
+        self.channel = _events_channel(user_id)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+
+    async def __aenter__(self) -> "TaskEventSubscription":
+        await _subscriber.add(self)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await _subscriber.remove(self)
+
+    def _push(self, item) -> None:
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Whatever is buffered is superseded by the reload RESYNC asks for
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(item if item is CLOSED else RESYNC)
+
+    async def get(self, timeout: float) -> Union[str, object, None]:
+        """Next JSON event, RESYNC, CLOSED once Redis is gone, or None after `timeout` idle seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
@@ -1,5 +1,8 @@
 from .config import (
     POSTGRESQL_CONFIG,
+    TASK_WRITER_CONFIG,
+    REMINDER_CONFIG,
+    PASSWORD_HASH_CONFIG,
     JWT_CONFIG,
     S3_CONFIG,
     REDIS_CONFIG,
@@ -1,19 +1,84 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, SecretStr
+from typing import List
 
 
 class PostgresqlConfig(BaseSettings):
     db_url: str = Field(alias="DATABASE_URL")
+    # Comma separated, reads are spread over them in turn when set
+    replica_urls_value: str = Field("", alias="DATABASE_REPLICA_URLS")
+    # How long a user's reads stay on the primary after their own write
+    read_your_writes_seconds: int = Field(5, alias="DATABASE_READ_YOUR_WRITES_SECONDS")
+    # Per engine, replicas get a pool of their own
+    pool_size: int = Field(10, alias="DATABASE_POOL_SIZE")
+    max_overflow: int = Field(10, alias="DATABASE_MAX_OVERFLOW")
+    pool_timeout: float = Field(30.0, alias="DATABASE_POOL_TIMEOUT")
+    pool_recycle: int = Field(1800, alias="DATABASE_POOL_RECYCLE")
+    pool_pre_ping: bool = Field(True, alias="DATABASE_POOL_PRE_PING")
+    # Connections opened at startup, capped by pool_size
+    pool_warmup: int = Field(5, alias="DATABASE_POOL_WARMUP")
+    # Prepared statement caches of asyncpg and of the SQLAlchemy dialect (both
+    # sized by this), 0 behind pgbouncer in transaction mode, see _connect_args
+    statement_cache_size: int = Field(100, alias="DATABASE_STATEMENT_CACHE_SIZE")
+    echo: bool = Field(False, alias="DATABASE_ECHO")
 
     model_config = SettingsConfigDict(
         title="PostgreSQL credential manager",
         env_file=None
     )
 
+    @property
+    def replica_urls(self) -> List[str]:
+        return [url.strip() for url in self.replica_urls_value.split(",") if url.strip()]
+
 
 POSTGRESQL_CONFIG = PostgresqlConfig()
 
 
+class TaskWriterConfig(BaseSettings):
+    # Opt-in group commit of POST /task, see app/database/batch_writer.py
+    enabled: bool = Field(False, alias="TASK_BATCH_WRITER_ENABLED")
+    max_batch_size: int = Field(100, alias="TASK_BATCH_WRITER_MAX_BATCH")
+    max_wait_ms: float = Field(5.0, alias="TASK_BATCH_WRITER_MAX_WAIT_MS")
+    max_queue_size: int = Field(1000, alias="TASK_BATCH_WRITER_QUEUE_SIZE")
+
+    model_config = SettingsConfigDict(
+        title="Task batch writer configuration",
+        env_file=None
+    )
+
+
+TASK_WRITER_CONFIG = TaskWriterConfig()
+
+
+class ReminderConfig(BaseSettings):
+    # Due-date reminders, see app/cache/reminders.py
+    lead_minutes: int = Field(15, alias="REMINDER_LEAD_MINUTES")
+    batch_size: int = Field(500, alias="REMINDER_BATCH_SIZE")
+
+    model_config = SettingsConfigDict(
+        title="Reminder configuration",
+        env_file=None
+    )
+
+
+REMINDER_CONFIG = ReminderConfig()
+
+
+class PasswordHashConfig(BaseSettings):
+    # bcrypt thread pool, see app/utils/password_manager.py
+    workers: int = Field(4, alias="PASSWORD_HASH_WORKERS")
+    max_queue_size: int = Field(64, alias="PASSWORD_HASH_QUEUE_SIZE")
+
+    model_config = SettingsConfigDict(
+        title="Password hashing configuration",
+        env_file=None
+    )
+
+
+PASSWORD_HASH_CONFIG = PasswordHashConfig()
+
+
 class JWTConfig(BaseSettings):
     secret_key: SecretStr = Field(alias="SECRET_KEY")
     algorithm: str = Field(alias="ALGORITHM")
@@ -14,3 +14,28 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
 )
+
+celery_app.conf.beat_schedule = {
+    # Redis task counters are incremented by the write paths,
+    # this repairs whatever drift crashes or evictions left behind
+    "reconcile-task-counters": {
+        "task": "reconcile_task_counters",
+        "schedule": 15 * 60,
+    },
+    # Picks up account purges that failed or were lost with a worker
+    "sweep-deleted-users": {
+        "task": "sweep_deleted_users",
+        "schedule": 60 * 60,
+    },
+    # Pops reminders due by now from the Redis schedule, no task table scan
+    "dispatch-due-reminders": {
+        "task": "dispatch_due_reminders",
+        "schedule": 60,
+    },
+    # Deletions older than TOMBSTONE_RETENTION are no longer reported
+    # by GET /task/changes, older sync tokens get 410 instead
+    "purge-task-tombstones": {
+        "task": "purge_task_tombstones",
+        "schedule": 24 * 60 * 60,
+    },
+}
@@ -1,10 +1,29 @@
 from app.core.celery_app import celery_app
-from app.utils.smtp_client import _send_code_verification
+from app.utils.smtp_client import _send_code_verification, _send_task_reminder
 import random
 import os
 from loguru import logger
 import asyncio
 from app.redis_client import redis_session
+from app.cache import task_counter, generation, reminders
+from app.config import REMINDER_CONFIG
+from app.database.database import async_session_factory
+from app.database import task as task_db
+from app.database import user as user_db
+from app.external import avatar as avatar_ext
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+# Tasks deleted per transaction while purging an account
+PURGE_CHUNK_SIZE = 1000
+# Deleted accounts still present after this long are purged again by the sweep
+PURGE_RETRY_AFTER = timedelta(hours=1)
+# Tombstones dropped per transaction by the retention job
+TOMBSTONE_PURGE_CHUNK_SIZE = 5000
+# Reminder emails in flight at once
+REMINDER_SEND_CONCURRENCY = 10
+# Reminders of tasks due longer ago than this (beat was down) are dropped, not sent late
+REMINDER_MAX_DELAY = timedelta(hours=1)
 
 
 async def start_verification(email: str) -> None:
@@ -14,14 +33,15 @@ async def start_verification(email: str) -> None:
     send_code.delay(email, code)
 
 
-@celery_app.task(name="send_verification_code")
-def send_code(email: str, code: str):
-    # Variable set in Dockerfile flag.
-    # If DEVELOPMENT MODE there is no sense in sending email
+def _development_mode() -> bool:
     # Variable set in Dockerfile flag.
     # If DEVELOPMENT_MODE is true there is no sense in sending email
-    dev_mode_env = os.getenv("DEVELOPMENT_MODE", "true").lower()
-    if dev_mode_env == "true":
+    return os.getenv("DEVELOPMENT_MODE", "true").lower() == "true"
+
+
+@celery_app.task(name="send_verification_code")
+def send_code(email: str, code: str):
+    if _development_mode():
         logger.info(f"Development mode activated, email sending skip: {email} with code: {code}")
         return
     try:
@@ -37,3 +57,205 @@ def send_code(email: str, code: str):
     except Exception as e:
         logger.error(f"Error sending email: {e}")
         return {"status": "error", "message": str(e)}
+
+
+async def _reconcile_task_counters() -> dict:
+    checked = repaired = 0
+    async for cached_counts in task_counter.scan_task_counts():
+        async with async_session_factory() as session:
+            actual_counts = await task_db.count_tasks_for_users(
+                user_ids=list(cached_counts), db=session
+            )
+        for user_id, cached in cached_counts.items():
+            checked += 1
+            actual = actual_counts[user_id]
+            if cached != actual and await task_counter.repair_task_count(user_id, cached, actual):
+                logger.warning(f"Repaired task counter of user {user_id}: {cached} -> {actual}")
+                repaired += 1
+    return {"checked": checked, "repaired": repaired}
+
+
+@celery_app.task(name="reconcile_task_counters")
+def reconcile_task_counters():
+    try:
+        loop = asyncio.get_event_loop()
+        result = loop.run_until_complete(_reconcile_task_counters())
+        logger.info(f"Task counters reconciled: {result}")
+        return result
+    except Exception as e:
+        logger.error(f"Error reconciling task counters: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+async def _purge_deleted_user(user_id: UUID) -> dict:
+    async with async_session_factory() as session:
+        user = await user_db.find_deleted_user(user_id, session)
+    if user is None:
+        return {"status": "skipped", "user_id": str(user_id)}
+
+    # Short transactions: no statement locks or loads more than a chunk
+    purged = 0
+    while True:
+        async with async_session_factory() as session:
+            deleted = await task_db.purge_user_tasks_chunk(user_id, session, PURGE_CHUNK_SIZE)
+        purged += deleted
+        if deleted < PURGE_CHUNK_SIZE:
+            break
+
+    # A failure here leaves the row in place for the sweep to retry
+    if user.avatar_url:
+        await avatar_ext.delete_avatar(user_id=user_id)
+    async with async_session_factory() as session:
+        await user_db.remove_deleted_user(user_id, session)
+
+    await task_counter.drop_task_count(user_id)
+    await generation.bump_generation(task_db.TASKS_NAMESPACE, user_id)
+    return {"status": "purged", "user_id": str(user_id), "tasks": purged}
+
+
+@celery_app.task(name="purge_deleted_user")
+def purge_deleted_user(user_id: str):
+    try:
+        loop = asyncio.get_event_loop()
+        result = loop.run_until_complete(_purge_deleted_user(UUID(user_id)))
+        logger.info(f"Deleted account processed: {result}")
+        return result
+    except Exception as e:
+        logger.error(f"Error purging deleted user {user_id}: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+async def _sweep_deleted_users() -> int:
+    async with async_session_factory() as session:
+        user_ids = await user_db.get_unpurged_user_ids(
+            datetime.now(timezone.utc) - PURGE_RETRY_AFTER, session
+        )
+    for user_id in user_ids:
+        purge_deleted_user.delay(str(user_id))
+    return len(user_ids)
+
+
+@celery_app.task(name="sweep_deleted_users")
+def sweep_deleted_users():
+    try:
+        loop = asyncio.get_event_loop()
+        requeued = loop.run_until_complete(_sweep_deleted_users())
+        if requeued:
+            logger.warning(f"Requeued the purge of {requeued} deleted accounts")
+        return {"requeued": requeued}
+    except Exception as e:
+        logger.error(f"Error sweeping deleted users: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+async def _purge_task_tombstones() -> int:
+    deleted_before = datetime.now(timezone.utc) - task_db.TOMBSTONE_RETENTION
+    purged = 0
+    while True:
+        async with async_session_factory() as session:
+            deleted = await task_db.purge_task_tombstones(
+                deleted_before, session, TOMBSTONE_PURGE_CHUNK_SIZE
+            )
+        purged += deleted
+        if deleted < TOMBSTONE_PURGE_CHUNK_SIZE:
+            return purged
+
+
+@celery_app.task(name="purge_task_tombstones")
+def purge_task_tombstones():
+    try:
+        loop = asyncio.get_event_loop()
+        purged = loop.run_until_complete(_purge_task_tombstones())
+        logger.info(f"Purged {purged} task tombstones")
+        return {"purged": purged}
+    except Exception as e:
+        logger.error(f"Error purging task tombstones: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+async def _send_reminders(recipients: dict) -> list:
+    """Mails each recipient its (task_id, title, appointed_at) entries, returns the task ids not delivered."""
+    semaphore = asyncio.Semaphore(REMINDER_SEND_CONCURRENCY)
+
+    async def send(email: str, username: str, entries: list) -> list:
+        if _development_mode():
+            logger.info(f"Development mode activated, reminder sending skip: {email} with {len(entries)} tasks")
+            return []
+        tasks = [(title, appointed_at) for _, title, appointed_at in entries]
+        async with semaphore:
+            if await _send_task_reminder(email=email, username=username, tasks=tasks):
+                return []
+        return [task_id for task_id, _, _ in entries]
+
+    failed = await asyncio.gather(*(
+        send(email, username, entries) for (email, username), entries in recipients.items()
+    ))
+    return [task_id for task_ids in failed for task_id in task_ids]
+
+
+async def _dispatch_due_reminders() -> dict:
+    now = datetime.now(timezone.utc)
+    # Scores are float seconds, the second of slack absorbs their rounding
+    due_before = now + reminders.reminder_lead() + timedelta(seconds=1)
+    sent = dropped = 0
+    while True:
+        popped = await reminders.pop_due_reminders(now, REMINDER_CONFIG.batch_size)
+        if not popped:
+            break
+        try:
+            async with async_session_factory() as session:
+                rows = await task_db.get_reminder_recipients(
+                    [task_id for task_id, _ in popped], due_before, now - REMINDER_MAX_DELAY, session
+                )
+        except Exception:
+            await reminders.restore_reminders(popped)
+            raise
+
+        recipients = {}
+        for row in rows:
+            recipients.setdefault((row.email, row.username), []).append(
+                (row.task_id, row.title, row.appointed_at.astimezone(timezone.utc))
+            )
+        failed = set(await _send_reminders(recipients))
+        # Popped before sending, so undelivered ones go back for the next run
+        await reminders.restore_reminders([entry for entry in popped if entry[0] in failed])
+        sent += len(rows) - len(failed)
+        dropped += len(popped) - len(rows)
+        if len(popped) < REMINDER_CONFIG.batch_size:
+            break
+    return {"sent": sent, "dropped": dropped}
+
+
+@celery_app.task(name="dispatch_due_reminders")
+def dispatch_due_reminders():
+    try:
+        loop = asyncio.get_event_loop()
+        result = loop.run_until_complete(_dispatch_due_reminders())
+        if result["sent"] or result["dropped"]:
+            logger.info(f"Due reminders dispatched: {result}")
+        return result
+    except Exception as e:
+        logger.error(f"Error dispatching due reminders: {e}")
+        return {"status": "error", "message": str(e)}
+
+
+async def _backfill_reminders() -> int:
+    scheduled = 0
+    async with async_session_factory() as session:
+        async for chunk in task_db.stream_upcoming_appointments(datetime.now(timezone.utc), session):
+            await reminders.schedule_reminders(dict(chunk))
+            scheduled += len(chunk)
+    return scheduled
+
+
+@celery_app.task(name="backfill_reminders")
+def backfill_reminders():
+    """Run once by hand (or after losing Redis): schedules every task due in the future."""
+    try:
+        loop = asyncio.get_event_loop()
+        scheduled = loop.run_until_complete(_backfill_reminders())
+        logger.info(f"Scheduled reminders of {scheduled} tasks")
+        return {"scheduled": scheduled}
+    except Exception as e:
+        logger.error(f"Error backfilling reminders: {e}")
+        return {"status": "error", "message": str(e)}
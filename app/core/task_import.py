@@ -0,0 +1,299 @@
+"""
+Streaming task import: NDJSON/CSV bytes -> TaskCreate validation -> COPY.
+
+Usable from the API (POST /task/import) and from the command line:
+    python -m app.core.task_import tasks.ndjson --user-id <uuid> [--format csv]
+The API returns the chunk reports once the upload ends, the command line
+prints each one as its chunk is committed.
+"""
+import argparse
+import asyncio
+import csv
+import json
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Union    # noqa: TYP001
+
+from loguru import logger
+from pydantic import ValidationError
+
+from app.database import task as task_db
+from app.database.database import AsyncSession, async_session_factory
+from app.schemas.task import TaskCreate
+from app.schemas.responses import TaskImportChunkReport
+
+IMPORT_FORMATS = ("ndjson", "csv")
+DEFAULT_CHUNK_SIZE = 1000
+# Errors kept per chunk report, the rest is only counted
+MAX_REPORTED_ERRORS = 20
+FILE_READ_SIZE = 64 * 1024
+# Far above a valid task (150 + 2000 characters), bounds what one line can buffer
+MAX_LINE_BYTES = 64 * 1024
+
+ProgressCallback = Callable[[TaskImportChunkReport], Awaitable[None]]
+
+
+class UndecodableImport(ValueError):
+    """A line is not UTF-8, the import stops there as nothing after it can be trusted."""
+
+    def __init__(self, line: int):
+        super().__init__(f"Line {line} is not UTF-8 encoded, import stopped")
+        self.line = line
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[Union[str, ValueError]]:
+    """
+    Splits a byte stream into decoded lines without buffering the whole stream.
+    A line longer than `max_line_bytes` is skipped up to its newline and
+    yielded as a ValueError in its place.
+    """
+    pending, line_number, overlong = b"", 0, False
+    async for chunk in chunks:
+        if overlong:
+            end = chunk.find(b"\n")
+            if end < 0:
+                continue
+            overlong, chunk = False, chunk[end + 1:]
+            line_number += 1
+            yield _line_too_long(max_line_bytes)
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_number += 1
+            yield _decode(line, line_number, max_line_bytes)
+        if len(pending) > max_line_bytes:
+            pending, overlong = b"", True
+    if overlong:
+        yield _line_too_long(max_line_bytes)
+    elif pending:
+        yield _decode(pending, line_number + 1, max_line_bytes)
+
+
+def _line_too_long(max_line_bytes: int) -> ValueError:
+    return ValueError(f"Line exceeds {max_line_bytes} bytes")
+
+
+def _decode(line: bytes, line_number: int, max_line_bytes: int) -> Union[str, ValueError]:
+    if len(line) > max_line_bytes:
+        return _line_too_long(max_line_bytes)
+    try:
+        return line.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError:
+        raise UndecodableImport(line_number) from None
+
+
+async def _iter_ndjson(lines: AsyncIterator[Union[str, ValueError]]) -> AsyncIterator[Tuple[int, object]]:
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if isinstance(line, ValueError):
+            yield line_number, line
+        elif line.strip():
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as error:
+                yield line_number, error
+
+
+async def _iter_csv(lines: AsyncIterator[Union[str, ValueError]]) -> AsyncIterator[Tuple[int, object]]:
+    header = None
+    record, record_start, line_number = [], 0, 0
+    async for line in lines:
+        line_number += 1
+        if not record:
+            record_start = line_number
+        if isinstance(line, ValueError):
+            # Whatever record the line belonged to is lost with it
+            yield record_start, line
+            record = []
+            continue
+        record.append(line)
+        # A quoted field may span several physical lines, wait until quotes balance
+        if sum(part.count('"') for part in record) % 2:
+            # Nor may an unclosed quote pull in the rest of the upload
+            if sum(len(part) for part in record) > MAX_LINE_BYTES:
+                yield record_start, ValueError(f"Record exceeds {MAX_LINE_BYTES} bytes")
+                record = []
+            continue
+        text = "\n".join(record)
+        record = []
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = values
+            continue
+        if len(values) != len(header):
+            yield record_start, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        yield record_start, {
+            key: (value if value != "" else None)
+            for key, value in zip(header, values)
+        }
+    if record:
+        yield record_start, ValueError("Unterminated quoted field")
+
+
+def iter_records(
+    chunks: AsyncIterator[bytes],
+    import_format: str
+) -> AsyncIterator[Tuple[int, object]]:
+    """Yields (line number, parsed item or the parsing error)."""
+    if import_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {import_format}")
+    lines = iter_lines(chunks, MAX_LINE_BYTES)
+    return _iter_csv(lines) if import_format == "csv" else _iter_ndjson(lines)
+
+
+def _to_record(item: object, user_id: UUID, created_at: datetime) -> tuple:
+    task = TaskCreate.model_validate(item)
+    return (uuid4(), task.title, task.description, task.appointed_at, created_at, user_id)
+
+
+def _collect(
+    line: int,
+    item: object,
+    records: List[tuple],
+    errors: List[dict],
+    user_id: UUID,
+    created_at: datetime
+) -> None:
+    if isinstance(item, Exception):
+        errors.append(_error(line, item))
+        return
+    try:
+        records.append(_to_record(item, user_id, created_at))
+    except ValidationError as error:
+        errors.append(_error(line, error))
+
+
+def _error(line: int, error: Exception) -> dict:
+    if isinstance(error, ValidationError):
+        message = "; ".join(
+            f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+            for item in error.errors(include_url=False, include_context=False)
+        )
+    else:
+        message = str(error)
+    return {"line": line, "message": message}
+
+
+async def _flush(
+    chunk: int,
+    rows: int,
+    records: List[tuple],
+    errors: List[dict],
+    user_id: UUID,
+    db: AsyncSession
+) -> TaskImportChunkReport:
+    imported = 0
+    if records:
+        try:
+            imported = await task_db.copy_tasks(records, db)
+            await db.commit()
+            await task_db.after_tasks_written(
+                user_id,
+                created=[record[0] for record in records],
+                due={record[0]: record[3] for record in records if record[3] is not None}
+            )
+        except Exception as error:
+            # COPY is all or nothing, the whole chunk is reported as failed
+            await db.rollback()
+            logger.error(f"COPY of import chunk {chunk} failed: {error}")
+            errors.append({"line": None, "message": f"Chunk rejected by database: {error}"})
+    report = TaskImportChunkReport(
+        chunk=chunk,
+        rows=rows,
+        imported=imported,
+        failed=rows - imported,
+        errors=errors[:MAX_REPORTED_ERRORS]
+    )
+    logger.info(
+        f"Import chunk {chunk} of user {user_id}: "
+        f"{report.imported}/{report.rows} rows imported"
+    )
+    return report
+
+
+async def import_tasks(
+    chunks: AsyncIterator[bytes],
+    import_format: str,
+    user_id: UUID,
+    db: AsyncSession,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_progress: Optional[ProgressCallback] = None
+) -> List[TaskImportChunkReport]:
+    """
+    Validates rows against TaskCreate and COPYs every `chunk_size` valid rows
+    in their own transaction, so at most one chunk is held in memory.
+    An undecodable line ends the import as a failed row of the last chunk:
+    the reports always match what was committed.
+    """
+    reports = []
+    records, errors, rows = [], [], 0
+    created_at = datetime.now(timezone.utc)
+    try:
+        async for line, item in iter_records(chunks, import_format):
+            rows += 1
+            _collect(line, item, records, errors, user_id, created_at)
+            if rows == chunk_size:
+                reports.append(await _flush(len(reports) + 1, rows, records, errors, user_id, db))
+                if on_progress:
+                    await on_progress(reports[-1])
+                records, errors, rows = [], [], 0
+    except UndecodableImport as error:
+        logger.warning(f"Import of user {user_id} stopped: {error}")
+        rows += 1
+        errors.append(_error(error.line, error))
+    if rows:
+        reports.append(await _flush(len(reports) + 1, rows, records, errors, user_id, db))
+        if on_progress:
+            await on_progress(reports[-1])
+    return reports
+
+
+async def _read_file(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(FILE_READ_SIZE):
+            yield chunk
+
+
+async def _print_progress(report: TaskImportChunkReport) -> None:
+    print(
+        f"chunk {report.chunk}: {report.imported}/{report.rows} imported, "
+        f"{report.failed} failed"
+    )
+    for error in report.errors:
+        print(f"  line {error['line']}: {error['message']}")
+
+
+async def _main(args: argparse.Namespace) -> int:
+    async with async_session_factory() as session:
+        reports = await import_tasks(
+            _read_file(args.path),
+            args.format,
+            args.user_id,
+            session,
+            chunk_size=args.chunk_size,
+            on_progress=_print_progress
+        )
+    imported = sum(report.imported for report in reports)
+    failed = sum(report.failed for report in reports)
+    print(f"done: {imported} imported, {failed} failed")
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import tasks of a user")
+    parser.add_argument("path", help="NDJSON or CSV file with title, description, appointed_at")
+    parser.add_argument("--user-id", type=UUID, required=True)
+    parser.add_argument("--format", choices=IMPORT_FORMATS, default="ndjson")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    raise SystemExit(asyncio.run(_main(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
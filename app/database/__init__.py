@@ -1,8 +1,12 @@
 from .database import (
     DeclarativeBase,
     get_db,
+    get_authed_db,
+    get_read_db,
+    get_read_session_factory,
     AsyncSession,
-    postgresql_engine
+    postgresql_engine,
+    async_session_factory
 )
 from .user import (
     find_user_by_id,
@@ -10,13 +14,33 @@ from .user import (
     authenticate_user,
     add_avatar,
     delete_avatar_database,
-    get_avatar
+    get_avatar,
+    mark_user_deleted,
+    find_deleted_user,
+    remove_deleted_user,
+    get_unpurged_user_ids
 )
 from app.database.task import (
     remove_task,
     get_task_by_id,
     update_task_by_id,
+    update_tasks,
+    remove_tasks,
+    purge_user_tasks_chunk,
+    purge_task_tombstones,
+    get_changes_horizon,
+    get_task_changes,
+    get_reminder_recipients,
+    stream_upcoming_appointments,
     create_task,
+    create_tasks,
+    copy_tasks,
     get_user_tasks,
-    count_user_tasks
+    get_user_tasks_after,
+    stream_user_tasks,
+    search_user_tasks,
+    count_user_tasks,
+    count_tasks_for_users,
+    get_task_stats,
+    after_tasks_written
 )
@@ -0,0 +1,117 @@
+from loguru import logger
+from typing import Any, Awaitable, Callable, Generic, List, Optional, Tuple, TypeVar    # noqa: TYP001
+import asyncio
+
+Item = TypeVar("Item")
+Result = TypeVar("Result")
+
+
+class BatchWriterFull(Exception):
+    """The queue of the writer is at capacity, the caller should write directly."""
+
+
+class BatchWriter(Generic[Item, Result]):
+    """
+    Group commit: items submitted concurrently within `max_wait` seconds of
+    each other (at most `max_batch_size` of them) are handed to `handler`
+    together, so they share one transaction and one WAL flush.
+
+    `handler` receives the items in submission order and returns one entry
+    per item, either its result or the exception raised for that item alone.
+    An exception escaping `handler` fails the whole batch.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Item]], Awaitable[List[Any]]],
+        max_batch_size: int = 100,
+        max_wait: float = 0.005,
+        max_queue_size: int = 1000,
+        name: str = "batch writer"
+    ):
+        self._handler = handler
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._max_queue_size = max_queue_size
+        self._name = name
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._accepting = False
+
+    @property
+    def running(self) -> bool:
+        return self._accepting
+
+    def start(self) -> None:
+        """Starts the flushing loop, must be called from the serving event loop."""
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._worker = asyncio.create_task(self._run())
+        self._accepting = True
+        logger.info(
+            f"{self._name} started: batches of up to {self._max_batch_size}, "
+            f"{self._max_wait * 1000:g} ms window"
+        )
+
+    async def stop(self) -> None:
+        """Stops accepting items, flushes the queued ones and ends the loop."""
+        if self._worker is None:
+            return
+        self._accepting = False
+        await self._queue.join()
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+        logger.info(f"{self._name} stopped")
+
+    async def submit(self, item: Item) -> Result:
+        """
+        Waits until the batch holding `item` is written and returns its result.
+        Raises BatchWriterFull when the queue is at capacity.
+        """
+        if not self._accepting:
+            raise RuntimeError(f"{self._name} is not running")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            raise BatchWriterFull(f"{self._name} queue is full") from None
+        return await future
+
+    async def _collect(self) -> List[Tuple[Item, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self._max_wait
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[Tuple[Item, asyncio.Future]]) -> None:
+        try:
+            results = await self._handler([item for item, _ in batch])
+        except Exception as error:
+            logger.error(f"{self._name} failed a batch of {len(batch)}: {error}")
+            results = [error] * len(batch)
+        for (_, future), result in zip(batch, results):
+            # The caller may have gone away (request cancelled) meanwhile
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -1,17 +1,50 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from fastapi import Depends
 from app.config import POSTGRESQL_CONFIG
+from app.cache import recent_writes
+from app.utils.oauth2Schema import get_current_user_id
+from app.database.pool import InstrumentedAsyncPool, warm_up_pool
 from sqlalchemy.orm import declarative_base
-from typing import AsyncGenerator   # noqa: TYP001
+from typing import AsyncGenerator, AsyncIterator   # noqa: TYP001
+from contextlib import asynccontextmanager
 from sqlalchemy.exc import SQLAlchemyError
 from loguru import logger
+from uuid import UUID, uuid4
+import itertools
 
 DeclarativeBase = declarative_base()
 
-postgresql_engine = create_async_engine(
-    url=POSTGRESQL_CONFIG.db_url,
-    echo=True
-)
+
+def _connect_args() -> dict:
+    cache_size = POSTGRESQL_CONFIG.statement_cache_size
+    connect_args = {
+        # asyncpg's own cache, and the one SQLAlchemy's asyncpg adapter keeps on top
+        "statement_cache_size": cache_size,
+        "prepared_statement_cache_size": cache_size
+    }
+    if cache_size == 0:
+        # Behind pgbouncer a backend may already hold a statement of the
+        # same default name prepared by another client
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    return connect_args
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url=url,
+        echo=POSTGRESQL_CONFIG.echo,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=POSTGRESQL_CONFIG.pool_size,
+        max_overflow=POSTGRESQL_CONFIG.max_overflow,
+        pool_timeout=POSTGRESQL_CONFIG.pool_timeout,
+        pool_recycle=POSTGRESQL_CONFIG.pool_recycle,
+        pool_pre_ping=POSTGRESQL_CONFIG.pool_pre_ping,
+        connect_args=_connect_args()
+    )
+
+
+postgresql_engine = _create_engine(POSTGRESQL_CONFIG.db_url)
 
 async_session_factory = sessionmaker(
     bind=postgresql_engine,
@@ -19,9 +52,21 @@ async_session_factory = sessionmaker(
     expire_on_commit=False
 )
 
+replica_engines = [
+    _create_engine(url) for url in POSTGRESQL_CONFIG.replica_urls
+]
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    session = async_session_factory()
+replica_session_factories = [
+    sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    for engine in replica_engines
+]
+
+_replica_rotation = itertools.cycle(replica_session_factories)
+
+
+@asynccontextmanager
+async def _session_scope(session_factory: sessionmaker) -> AsyncIterator[AsyncSession]:
+    session = session_factory()
     try:
         async with session:
             yield session
@@ -31,3 +76,57 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         raise
     finally:
         await session.close()
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with _session_scope(async_session_factory) as session:
+        yield session
+
+
+async def get_authed_db(
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> AsyncSession:
+    """
+    Session for endpoints that require a valid token. Dependencies resolve
+    in declaration order, so a rejected token never reaches get_db. The
+    session itself only checks out a pooled connection on its first query.
+    """
+    return db
+
+
+async def get_read_session_factory(user_id: UUID) -> sessionmaker:
+    """
+    Session factory for a read on behalf of `user_id`: the next replica in
+    turn, or the primary while the user's own recent write may not have
+    replicated yet (and whenever no replica is configured).
+    """
+    if not replica_session_factories:
+        return async_session_factory
+    if await recent_writes.has_recent_write(user_id):
+        return async_session_factory
+    return next(_replica_rotation)
+
+
+async def get_read_db(
+    user_id: str = Depends(get_current_user_id)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Read-only session for GET endpoints, see get_read_session_factory."""
+    session_factory = await get_read_session_factory(user_id)
+    async with _session_scope(session_factory) as session:
+        yield session
+
+
+async def warm_up_engines() -> None:
+    """Fills the pool of the primary and of every replica up to DATABASE_POOL_WARMUP."""
+    connections = min(POSTGRESQL_CONFIG.pool_warmup, POSTGRESQL_CONFIG.pool_size)
+    if connections <= 0:
+        return
+    for engine in (postgresql_engine, *replica_engines):
+        opened = await warm_up_pool(engine, connections)
+        logger.info(f"Opened {opened}/{connections} connections to {engine.url.host}")
+
+
+async def dispose_engines() -> None:
+    for engine in (postgresql_engine, *replica_engines):
+        await engine.dispose()
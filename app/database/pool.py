@@ -0,0 +1,82 @@
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from loguru import logger
+import asyncio
+import time
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that also records how long checkouts wait for a connection.
+    Wait time covers queueing for a free connection as well as opening a
+    new one (and the pre-ping, when enabled): all of it is latency the
+    request pays before its first statement.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._acquisitions = 0
+        self._acquire_timeouts = 0
+        self._waiting = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def connect(self):
+        self._waiting += 1
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self._acquire_timeouts += 1
+            raise
+        finally:
+            self._waiting -= 1
+        waited = time.perf_counter() - started
+        self._acquisitions += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        return connection
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            "waiting": self._waiting,
+            "acquisitions": self._acquisitions,
+            "acquire_timeouts": self._acquire_timeouts,
+            "wait_avg_ms": round(
+                self._wait_total / self._acquisitions * 1000, 3
+            ) if self._acquisitions else 0.0,
+            "wait_max_ms": round(self._wait_max * 1000, 3)
+        }
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    if isinstance(pool, InstrumentedAsyncPool):
+        return pool.stats()
+    return {"status": pool.status()}
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> int:
+    """
+    Opens `connections` connections at once and hands them back to the pool,
+    so the first requests after startup do not pay the connect cost.
+    Returns how many were opened, failures are logged and skipped.
+    """
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(connections)),
+        return_exceptions=True
+    )
+    opened = [result for result in results if not isinstance(result, BaseException)]
+    for connection in opened:
+        await connection.close()
+    failed = len(results) - len(opened)
+    if failed:
+        logger.warning(f"Pool warmup of {engine.url.host} could not open {failed} connections: "
+                       f"{next(r for r in results if isinstance(r, BaseException))}")
+    return len(opened)
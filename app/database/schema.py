@@ -0,0 +1,41 @@
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.ext.asyncio import AsyncEngine
+from loguru import logger
+from pathlib import Path
+from typing import Optional
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database has not been migrated to the revision this code expects."""
+
+
+def _current_revision(connection) -> Optional[str]:
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+async def check_schema_revision(engine: AsyncEngine) -> str:
+    """
+    Startup check in place of create_all: one SELECT on alembic_version
+    compared with the head of app/migrations. Migrations themselves run
+    once per deploy (`alembic upgrade head`), never from the workers.
+
+    A revision unknown to this code is newer than it (a rolling deploy
+    has migrated ahead of the old workers) and is accepted with a warning.
+    """
+    script = ScriptDirectory.from_config(Config(str(ALEMBIC_INI)))
+    head = script.get_current_head()
+    async with engine.connect() as connection:
+        current = await connection.run_sync(_current_revision)
+
+    if current == head:
+        return current
+    if current is not None and current not in {revision.revision for revision in script.walk_revisions()}:
+        logger.warning(f"Database schema {current} is newer than this code ({head})")
+        return current
+    raise SchemaOutOfDate(
+        f"Database schema is at {current or 'no revision'}, expected {head}: run `alembic upgrade head`"
+    )
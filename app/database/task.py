@@ -1,11 +1,122 @@
-from app.models.models import Task
+from app.models.models import Task, TaskTombstone, TaskDailyStats, User
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import func, tuple_, insert, update, delete, any_, literal, or_, and_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import Uuid
+from sqlalchemy.orm import load_only
 from loguru import logger
-from app.schemas.task import TaskCreate, TaskUpdate
-from uuid import UUID
-from typing import Optional, List
+from app.schemas.task import TaskCreate, TaskUpdate, TaskFilter
+from app.cache import task_counter, task_cache, generation, recent_writes, task_events, reminders
+from app.config import TASK_WRITER_CONFIG
+from app.database.database import async_session_factory
+from app.database.batch_writer import BatchWriter, BatchWriterFull
+from uuid import UUID, uuid4
+from typing import Optional, List, Tuple, Dict, AsyncIterator, Sequence, Mapping    # noqa: TYP001
+from datetime import date, datetime, timezone, timedelta
+
+
+# Generation namespace versioning everything derived from a user's task list
+TASKS_NAMESPACE = "tasks"
+# How long deletions stay reportable by get_task_changes
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+async def after_tasks_written(
+    user_id: UUID,
+    created: Sequence[UUID] = (),
+    updated: Sequence[UUID] = (),
+    deleted: Sequence[UUID] = (),
+    due: Optional[Mapping[UUID, Optional[datetime]]] = None
+) -> None:
+    """
+    Keeps the Redis side in step with a committed task write.
+    Every write path, including bulk ones, must call it after commit,
+    with `due` holding the appointed_at of tasks that got or changed one.
+    """
+    # First, so that the user's next read already goes to the primary
+    await recent_writes.mark_recent_write(user_id)
+    await task_counter.adjust_task_count(user_id, len(created) - len(deleted))
+    await task_cache.invalidate_tasks(user_id, [*updated, *deleted])
+    # Makes every cached list page of the user unreachable at once
+    await generation.bump_generation(TASKS_NAMESPACE, user_id)
+    await task_events.publish_task_events(user_id, created, updated, deleted)
+    await reminders.schedule_reminders(due or {})
+    await reminders.cancel_reminders(deleted)
+
+
+def _appointments(rows: Sequence[dict]) -> Dict[UUID, datetime]:
+    return {row["task_id"]: row["appointed_at"] for row in rows if row["appointed_at"] is not None}
+
+
+def _task_row(task: TaskCreate, user_id: UUID, created_at: datetime) -> dict:
+    return {
+        "task_id": uuid4(),
+        "title": task.title,
+        "description": task.description,
+        "appointed_at": task.appointed_at,
+        "created_at": created_at,
+        "user_fk": user_id
+    }
+
+
+async def _insert_task(task: TaskCreate, user_id: UUID, db: AsyncSession) -> UUID:
+    row = _task_row(task, user_id, datetime.now(timezone.utc))
+    query = await db.execute(
+        insert(Task)
+        .values(**row)
+        .returning(Task.task_id)
+    )
+    task_id = query.scalar_one()
+    await db.commit()
+    await after_tasks_written(user_id, created=[task_id], due=_appointments([row]))
+    return task_id
+
+
+async def _insert_task_group(items: List[Tuple[TaskCreate, UUID]]) -> List[object]:
+    """
+    Batch handler of task_writer: every queued task, whatever its user, in one
+    multi-row INSERT and one commit. If that fails (e.g. the user of one item
+    was just deleted) each task is retried in its own transaction, so only
+    the offending items get an error.
+    """
+    created_at = datetime.now(timezone.utc)
+    rows = [_task_row(task, user_id, created_at) for task, user_id in items]
+    async with async_session_factory() as session:
+        try:
+            await session.execute(insert(Task).values(rows))
+            await session.commit()
+        except Exception as error:
+            await session.rollback()
+            logger.warning(f"Group insert of {len(rows)} tasks failed, retrying one by one: {error}")
+            return [await _insert_task_isolated(task, user_id, session) for task, user_id in items]
+
+    created: Dict[UUID, List[dict]] = {}
+    for row in rows:
+        created.setdefault(row["user_fk"], []).append(row)
+    for user_id, user_rows in created.items():
+        await after_tasks_written(
+            user_id, created=[row["task_id"] for row in user_rows], due=_appointments(user_rows)
+        )
+    return [row["task_id"] for row in rows]
+
+
+async def _insert_task_isolated(task: TaskCreate, user_id: UUID, db: AsyncSession) -> object:
+    try:
+        return await _insert_task(task, user_id, db)
+    except Exception as error:
+        await db.rollback()
+        return error
+
+
+# Started by the app lifespan when TASK_BATCH_WRITER_ENABLED is set
+task_writer: BatchWriter[Tuple[TaskCreate, UUID], UUID] = BatchWriter(
+    _insert_task_group,
+    max_batch_size=TASK_WRITER_CONFIG.max_batch_size,
+    max_wait=TASK_WRITER_CONFIG.max_wait_ms / 1000,
+    max_queue_size=TASK_WRITER_CONFIG.max_queue_size,
+    name="Task batch writer"
+)
 
 
 async def create_task(
@@ -13,19 +124,47 @@ async def create_task(
     user_id: UUID,
     db: AsyncSession
 ) -> Optional[UUID]:
+    """
+    Inserts one task. With the batch writer running the insert is coalesced
+    with concurrent ones into a shared transaction, a full writer queue falls
+    back to a transaction of its own on `db`.
+    """
+    try:
+        if task_writer.running:
+            try:
+                return await task_writer.submit((task, user_id))
+            except BatchWriterFull:
+                logger.warning("Task batch writer is saturated, inserting directly")
+        return await _insert_task(task, user_id, db)
+    except Exception as error:
+        logger.error(f"Error during task creation: {error}")
+        await db.rollback()
+        return None
+
+
+async def create_tasks(
+    tasks: List[TaskCreate],
+    user_id: UUID,
+    db: AsyncSession
+) -> Optional[List[UUID]]:
+    """
+    Inserts all tasks with one multi-row INSERT ... RETURNING in one transaction.
+    Ids are generated here, so the returned list follows the order of `tasks`.
+    """
     try:
-        db_task = Task(
-            title=task.title,
-            description=task.description,
-            appointed_at=task.appointed_at,
-            user_fk=user_id
+        created_at = datetime.now(timezone.utc)
+        rows = [_task_row(task, user_id, created_at) for task in tasks]
+        query = await db.execute(
+            insert(Task).values(rows).returning(Task.task_id)
         )
-        db.add(db_task)
+        inserted = set(query.scalars().all())
         await db.commit()
-        await db.refresh(db_task)
-        return db_task.task_id
+        rows = [row for row in rows if row["task_id"] in inserted]
+        created_ids = [row["task_id"] for row in rows]
+        await after_tasks_written(user_id, created=created_ids, due=_appointments(rows))
+        return created_ids
     except Exception as error:
-        logger.error(f"Error during task creation: {error}")
+        logger.error(f"Error during batch task creation: {error}")
         await db.rollback()
         return None
 
@@ -54,60 +193,273 @@ async def update_task_by_id(
     user_id: UUID,
     db: AsyncSession
 ) -> Optional[Task]:
+    """Single UPDATE ... RETURNING, None if the task is missing or not owned."""
     try:
-        existing_task = await get_task_by_id(
-            task_id=task_id,
-            user_id=user_id,
-            db=db
-        )
-
-        if existing_task is None:
-            logger.warning(f"Task {task_id} not found or access denied")
-            return None
-
         update_data = task_update_data.model_dump(exclude_unset=True)
+        if not update_data:
+            return await get_task_by_id(task_id=task_id, user_id=user_id, db=db)
 
-        for key, value in update_data.items():
-            if hasattr(existing_task, key):
-                setattr(existing_task, key, value)
-
+        query = await db.execute(
+            update(Task)
+            .where(Task.task_id == task_id, Task.user_fk == user_id)
+            .values(**update_data)
+            .returning(Task)
+            .execution_options(synchronize_session=False)
+        )
+        updated_task = query.scalar_one_or_none()
         await db.commit()
-        await db.refresh(existing_task)
-        return existing_task
+        if updated_task is None:
+            logger.warning(f"Task {task_id} not found or access denied")
+        else:
+            due = {task_id: updated_task.appointed_at} if "appointed_at" in update_data else None
+            await after_tasks_written(user_id, updated=[task_id], due=due)
+        return updated_task
     except Exception as error:
         await db.rollback()
         logger.error(f"Update failed: {error}")
         return None
 
 
+def _delete_with_tombstones(*where):
+    """
+    WITH deleted AS (DELETE ... RETURNING) INSERT INTO task_tombstone ...
+    The tombstones are written by the deleting statement itself, a delete can
+    never go unreported to delta sync. Returns the deleted task ids.
+    """
+    deleted = (
+        delete(Task)
+        .where(*where)
+        .returning(Task.task_id, Task.user_fk)
+        .cte("deleted")
+    )
+    return (
+        insert(TaskTombstone)
+        .from_select(["task_id", "user_fk"], select(deleted.c.task_id, deleted.c.user_fk))
+        .returning(TaskTombstone.task_id)
+    )
+
+
 async def remove_task(task_id: UUID, user_id: UUID, db: AsyncSession) -> bool:
     try:
-        existing_task = await get_task_by_id(
-            task_id=task_id,
-            user_id=user_id,
-            db=db
-        )
-        if existing_task:
-            await db.delete(existing_task)
-            await db.commit()
-            return True
-        return False
+        query = await db.execute(
+            _delete_with_tombstones(Task.task_id == task_id, Task.user_fk == user_id)
+        )
+        deleted = query.scalar_one_or_none() is not None
+        await db.commit()
+        if deleted:
+            await after_tasks_written(user_id, deleted=[task_id])
+        return deleted
     except Exception as error:
         await db.rollback()
         logger.error(f"Delete failed: {error}")
         return False
 
 
+def _owned_tasks(task_ids: List[UUID], user_id: UUID) -> tuple:
+    # A single array parameter keeps the statement text identical for any
+    # number of ids, so asyncpg reuses one prepared statement
+    return (
+        Task.task_id == any_(literal(task_ids, ARRAY(Uuid))),
+        Task.user_fk == user_id
+    )
+
+
+async def update_tasks(
+    task_ids: List[UUID],
+    task_update_data: TaskUpdate,
+    user_id: UUID,
+    db: AsyncSession
+) -> Optional[List[UUID]]:
+    """Applies the same changes to every listed task of the user in one UPDATE."""
+    try:
+        update_data = task_update_data.model_dump(exclude_unset=True)
+        query = await db.execute(
+            update(Task)
+            .where(*_owned_tasks(task_ids, user_id))
+            .values(**update_data)
+            .returning(Task.task_id)
+            .execution_options(synchronize_session=False)
+        )
+        updated_ids = query.scalars().all()
+        await db.commit()
+        due = None
+        if "appointed_at" in update_data:
+            due = dict.fromkeys(updated_ids, update_data["appointed_at"])
+        await after_tasks_written(user_id, updated=updated_ids, due=due)
+        return updated_ids
+    except Exception as error:
+        await db.rollback()
+        logger.error(f"Batch update failed: {error}")
+        return None
+
+
+async def remove_tasks(
+    task_ids: List[UUID],
+    user_id: UUID,
+    db: AsyncSession
+) -> Optional[List[UUID]]:
+    """Deletes every listed task of the user in one DELETE."""
+    try:
+        query = await db.execute(
+            _delete_with_tombstones(*_owned_tasks(task_ids, user_id))
+        )
+        deleted_ids = query.scalars().all()
+        await db.commit()
+        await after_tasks_written(user_id, deleted=deleted_ids)
+        return deleted_ids
+    except Exception as error:
+        await db.rollback()
+        logger.error(f"Batch delete failed: {error}")
+        return None
+
+
+async def purge_user_tasks_chunk(user_id: UUID, db: AsyncSession, chunk_size: int = 1000) -> int:
+    """
+    Deletes up to `chunk_size` tasks of a deleted account in a transaction of
+    its own, returns how many went. Keeps locks and WAL per statement bounded;
+    the Redis state of the user is dropped by the caller once all are gone.
+    No tombstones: nobody is left to sync. Errors are left to the caller.
+    """
+    chunk = (
+        select(Task.task_id)
+        .where(Task.user_fk == user_id)
+        .limit(chunk_size)
+        .scalar_subquery()
+    )
+    query = await db.execute(
+        delete(Task)
+        .where(Task.task_id.in_(chunk))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return query.rowcount
+
+
+async def purge_task_tombstones(deleted_before: datetime, db: AsyncSession, chunk_size: int = 5000) -> int:
+    """Drops up to `chunk_size` tombstones older than `deleted_before`, errors are left to the caller."""
+    chunk = (
+        select(TaskTombstone.task_id)
+        .where(TaskTombstone.deleted_at < deleted_before)
+        .limit(chunk_size)
+        .scalar_subquery()
+    )
+    query = await db.execute(
+        delete(TaskTombstone).where(TaskTombstone.task_id.in_(chunk))
+    )
+    await db.commit()
+    return query.rowcount
+
+
+async def get_changes_horizon(db: AsyncSession, settle: timedelta) -> datetime:
+    """
+    Upper bound for a delta sync window: the database clock (the one stamping
+    writes) minus `settle`. Timestamps are transaction start times, so a write
+    becomes visible at commit with a time in the past; `settle` must exceed the
+    longest write transaction or a later window would skip that write.
+    """
+    query = await db.execute(select(func.clock_timestamp() - settle))
+    return query.scalar_one()
+
+
+async def get_task_changes(
+    user_id: UUID,
+    db: AsyncSession,
+    after: Tuple[datetime, UUID],
+    until: datetime,
+    limit: int = 100
+) -> Tuple[List[Task], List[TaskTombstone]]:
+    """
+    Tasks written and tasks deleted with (time, task_id) after `after` and time
+    at or before `until` (see get_changes_horizon), each in keyset order, at
+    most `limit + 1` of each: the caller merges both and pages through them.
+    """
+    try:
+        changed = await db.execute(
+            select(Task)
+            .where(
+                Task.user_fk == user_id,
+                tuple_(Task.updated_at, Task.task_id) > tuple_(*after),
+                Task.updated_at <= until
+            )
+            .order_by(Task.updated_at, Task.task_id)
+            .limit(limit + 1)
+        )
+        deleted = await db.execute(
+            select(TaskTombstone)
+            .where(
+                TaskTombstone.user_fk == user_id,
+                tuple_(TaskTombstone.deleted_at, TaskTombstone.task_id) > tuple_(*after),
+                TaskTombstone.deleted_at <= until
+            )
+            .order_by(TaskTombstone.deleted_at, TaskTombstone.task_id)
+            .limit(limit + 1)
+        )
+        return changed.scalars().all(), deleted.scalars().all()
+    except Exception as error:
+        logger.error(f"Failed to get task changes: {error}")
+        raise
+
+
+def _filter_user_tasks(statement, user_id: UUID, filters: Optional[TaskFilter]):
+    statement = statement.where(Task.user_fk == user_id)
+    if filters is None:
+        return statement
+    if filters.due_only:
+        statement = statement.where(Task.appointed_at.is_not(None))
+    if filters.due_after:
+        statement = statement.where(Task.appointed_at >= filters.due_after)
+    if filters.due_before:
+        statement = statement.where(Task.appointed_at < filters.due_before)
+    if filters.overdue:
+        statement = statement.where(Task.appointed_at < func.now())
+    return statement
+
+
+def _sort_keys(filters: Optional[TaskFilter]) -> tuple:
+    """
+    (sort column, descending). Both directions are plain forward/backward
+    scans of ix_task_user_created or ix_task_user_appointed, with task_id
+    as tie-breaker.
+    """
+    if filters is None:
+        return Task.created_at, False
+    return getattr(Task, filters.sort_field), filters.descending
+
+
+def _project(statement, fields: Optional[Sequence[str]], *required):
+    """
+    Restricts the Task columns loaded by `statement` to `fields` (plus the
+    primary key and `required` columns, e.g. the sort key a cursor is built
+    from). Columns left out are never read from Postgres, accessing them on
+    the returned tasks is an error.
+    """
+    if fields is None:
+        return statement
+    return statement.options(
+        load_only(*(getattr(Task, field) for field in fields), *required)
+    )
+
+
+def _order_by(column, descending: bool) -> tuple:
+    if descending:
+        return column.desc(), Task.task_id.desc()
+    return column, Task.task_id
+
+
 async def get_user_tasks(
     user_id: UUID,
     db: AsyncSession,
     skip: int = 0,
-    limit: int = 10
+    limit: int = 10,
+    filters: Optional[TaskFilter] = None,
+    fields: Optional[Sequence[str]] = None
 ) -> List[Task]:
     try:
+        column, descending = _sort_keys(filters)
+        statement = _project(select(Task), fields)
         query = await db.execute(
-            select(Task)
-            .where(Task.user_fk == user_id)
+            _filter_user_tasks(statement, user_id, filters)
+            .order_by(*_order_by(column, descending))
             .offset(skip)
             .limit(limit)
         )
@@ -117,13 +469,253 @@ async def get_user_tasks(
         return []
 
 
-async def count_user_tasks(user_id: UUID, db: AsyncSession) -> int:
+async def get_user_tasks_after(
+    user_id: UUID,
+    db: AsyncSession,
+    after: Optional[Tuple[datetime, UUID]] = None,
+    limit: int = 10,
+    filters: Optional[TaskFilter] = None,
+    fields: Optional[Sequence[str]] = None
+) -> List[Task]:
+    """
+    Keyset pagination over (sort column, task_id), `after` holds the values
+    of the last row of the previous page. Walks the matching index, so any
+    page costs the same regardless of how deep it is.
+    """
+    try:
+        column, descending = _sort_keys(filters)
+        statement = _filter_user_tasks(
+            _project(select(Task), fields, column), user_id, filters
+        )
+        if after is not None:
+            position = tuple_(column, Task.task_id)
+            statement = statement.where(
+                position < tuple_(*after) if descending else position > tuple_(*after)
+            )
+        query = await db.execute(
+            statement
+            .order_by(*_order_by(column, descending))
+            .limit(limit)
+        )
+        return query.scalars().all()
+    except Exception as error:
+        logger.error(f"Failed to get tasks page: {error}")
+        return []
+
+
+# Must match the configuration of the generated Task.search_vector column
+SEARCH_CONFIG = "simple"
+
+
+async def search_user_tasks(
+    user_id: UUID,
+    query_text: str,
+    db: AsyncSession,
+    after: Optional[Tuple[float, UUID]] = None,
+    limit: int = 10,
+    fields: Optional[Sequence[str]] = None
+) -> List[Tuple[Task, float]]:
+    """
+    Full-text search over title and description through the GIN index.
+    Results are ordered by rank, keyset pagination continues after (rank, task_id).
+    """
+    try:
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query_text)
+        rank = func.ts_rank_cd(Task.search_vector, ts_query)
+        statement = _project(select(Task, rank.label("rank")), fields).where(
+            Task.user_fk == user_id,
+            Task.search_vector.bool_op("@@")(ts_query)
+        )
+        if after is not None:
+            after_rank, after_task_id = after
+            statement = statement.where(
+                or_(
+                    rank < after_rank,
+                    and_(rank == after_rank, Task.task_id > after_task_id)
+                )
+            )
+        query = await db.execute(
+            statement
+            .order_by(rank.desc(), Task.task_id)
+            .limit(limit)
+        )
+        return query.all()
+    except Exception as error:
+        logger.error(f"Failed to search tasks: {error}")
+        return []
+
+
+# Column order of the records passed to copy_tasks
+COPY_COLUMNS = (
+    "task_id",
+    "title",
+    "description",
+    "appointed_at",
+    "created_at",
+    "user_fk"
+)
+
+
+async def copy_tasks(records: List[tuple], db: AsyncSession) -> int:
+    """
+    Loads records (ordered as COPY_COLUMNS) through the COPY protocol
+    on the connection of the session. Errors are left to the caller.
+    """
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        Task.__tablename__,
+        records=records,
+        columns=COPY_COLUMNS
+    )
+    return len(records)
+
+
+async def stream_user_tasks(
+    user_id: UUID,
+    db: AsyncSession,
+    chunk_size: int = 1000,
+    fields: Optional[Sequence[str]] = None
+) -> AsyncIterator[Task]:
+    """
+    Yields every task of the user through a server-side cursor,
+    only `chunk_size` rows are held in memory at a time.
+    """
+    result = await db.stream(
+        _project(select(Task), fields)
+        .where(Task.user_fk == user_id)
+        .order_by(Task.created_at, Task.task_id)
+        .execution_options(yield_per=chunk_size)
+    )
+    async for task in result.scalars():
+        yield task
+
+
+async def count_user_tasks(
+    user_id: UUID,
+    db: AsyncSession,
+    filters: Optional[TaskFilter] = None
+) -> int:
+    """
+    Unfiltered counts are served from the Redis counter when it is primed,
+    the aggregate query only runs on a cache miss and primes the counter
+    for the next calls. Filtered counts always go to Postgres.
+    """
+    filtered = filters is not None and filters.due_only
+    if not filtered:
+        cached = await task_counter.get_task_count(user_id)
+        if cached is not None:
+            return cached
     try:
         query = await db.execute(
-            select(func.count(Task.task_id))
-            .where(Task.user_fk == user_id)
+            _filter_user_tasks(
+                select(func.count(Task.task_id)), user_id, filters
+            )
         )
-        return query.scalar()
+        count = query.scalar()
+        if not filtered:
+            await task_counter.prime_task_count(user_id, count)
+        return count
     except Exception as error:
         logger.error(f"Failed to get tasks count: {error}")
         return 0
+
+
+async def get_task_stats(user_id: UUID, db: AsyncSession, since: date) -> dict:
+    """
+    Dashboard figures in two short queries. The total and the per-day
+    histogram (UTC days from `since` on) come from task_daily_stats, kept by
+    triggers; overdue and due-today are a range scan of ix_task_user_appointed
+    that stops at the end of today.
+    """
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    total = (
+        select(func.coalesce(func.sum(TaskDailyStats.created), 0))
+        .where(TaskDailyStats.user_fk == user_id)
+        .scalar_subquery()
+    )
+    try:
+        query = await db.execute(
+            select(
+                total,
+                func.count().filter(Task.appointed_at < func.now()),
+                func.count().filter(Task.appointed_at >= today)
+            )
+            .where(Task.user_fk == user_id, Task.appointed_at < today + timedelta(days=1))
+        )
+        total_count, overdue, due_today = query.one()
+        histogram = await db.execute(
+            select(TaskDailyStats.day, TaskDailyStats.created)
+            .where(
+                TaskDailyStats.user_fk == user_id,
+                TaskDailyStats.day >= since,
+                TaskDailyStats.created > 0
+            )
+            .order_by(TaskDailyStats.day)
+        )
+        return {
+            "total": total_count,
+            "overdue": overdue,
+            "due_today": due_today,
+            "created_per_day": [{"day": day, "count": count} for day, count in histogram.all()]
+        }
+    except Exception as error:
+        logger.error(f"Failed to get task stats: {error}")
+        raise
+
+
+async def count_tasks_for_users(
+    user_ids: List[UUID],
+    db: AsyncSession
+) -> Dict[UUID, int]:
+    """Authoritative task counts, users without tasks are reported as 0."""
+    query = await db.execute(
+        select(Task.user_fk, func.count(Task.task_id))
+        .where(Task.user_fk.in_(user_ids))
+        .group_by(Task.user_fk)
+    )
+    counts = {user_id: 0 for user_id in user_ids}
+    counts.update({user_id: count for user_id, count in query.all()})
+    return counts
+
+
+async def get_reminder_recipients(
+    task_ids: List[UUID],
+    due_before: datetime,
+    due_after: datetime,
+    db: AsyncSession
+) -> list:
+    """
+    Title, due time and owner email of each listed task still due within
+    (`due_after`, `due_before`], in one primary key lookup joined to users.
+    Tasks deleted or rescheduled since their reminder was queued drop out,
+    as do accounts that are unverified or deleted. Errors are left to the caller.
+    """
+    query = await db.execute(
+        select(Task.task_id, Task.title, Task.appointed_at, User.email, User.username)
+        .join(User, User.user_id == Task.user_fk)
+        .where(
+            Task.task_id == any_(literal(task_ids, ARRAY(Uuid))),
+            Task.appointed_at > due_after,
+            Task.appointed_at <= due_before,
+            User.is_verified.is_(True),
+            User.deleted_at.is_(None)
+        )
+        .order_by(User.email, Task.appointed_at)
+    )
+    return query.all()
+
+
+async def stream_upcoming_appointments(
+    due_after: datetime,
+    db: AsyncSession,
+    chunk_size: int = 5000
+) -> AsyncIterator[List[Tuple[UUID, datetime]]]:
+    """Chunks of (task_id, appointed_at) of every task due after `due_after`, for a reminder backfill."""
+    result = await db.stream(
+        select(Task.task_id, Task.appointed_at)
+        .where(Task.appointed_at > due_after)
+        .execution_options(yield_per=chunk_size)
+    )
+    async for partition in result.partitions():
+        yield [tuple(row) for row in partition]
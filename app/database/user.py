@@ -1,11 +1,21 @@
 from app.models.models import User
 from sqlalchemy.future import select
+from sqlalchemy import update, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 from app.schemas.user import UserLogin, UserSignup
-from app.utils.password_manager import hash_password, verify_password
+from app.utils.password_manager import hash_password_async, verify_password_async, PasswordHasherBusy
+from app.cache import generation, recent_writes, revoked_users
 import uuid
 from uuid import UUID
+from datetime import datetime
+from typing import List
+
+
+# Generation namespace versioning the avatar of a user (ETag of GET /user/avatar)
+AVATAR_NAMESPACE = "avatar"
 
 
 async def find_user_by_id(user_id: UUID, db: AsyncSession) -> User | None:
@@ -18,39 +28,68 @@ async def find_user_by_id(user_id: UUID, db: AsyncSession) -> User | None:
 
 
 async def create_user(user: UserSignup, db: AsyncSession) -> User | None:
+    """
+    Single INSERT ... ON CONFLICT DO NOTHING RETURNING.
+    A taken email or username yields no row and is reported as None.
+    Hashing happens before the session is used, PasswordHasherBusy propagates.
+    """
+    hashed_pw = await hash_password_async(user.password)
     try:
-        query = await db.execute(select(User).where(User.email == user.email))
-        existing_user = query.scalar_one_or_none()
-
-        if existing_user:
-            logger.warning(f"User with email {user.email} already exists")
-            return None
-
-        hashed_pw = hash_password(user.password)
-        user_to_add = User(
-            username=user.username,
-            password=hashed_pw,
-            email=user.email
+        query = await db.execute(
+            insert(User)
+            .values(
+                user_id=uuid.uuid4(),
+                username=user.username,
+                password=hashed_pw,
+                email=user.email
+            )
+            .on_conflict_do_nothing()
+            .returning(User)
         )
-
-        db.add(user_to_add)
+        created_user = query.scalar_one_or_none()
         await db.commit()
-        await db.refresh(user_to_add)
-        return user_to_add
 
+        if created_user is None:
+            logger.warning(f"User with email {user.email} or username {user.username} already exists")
+        return created_user
+
+    except IntegrityError as error:
+        await db.rollback()
+        logger.warning(f"Unique violation during user creation: {error}")
+        return None
     except Exception as error:
         await db.rollback()
         logger.error(f"Cannot insert user into db: {error}")
         raise error
 
 
+async def _update_user(where, values: dict, db: AsyncSession) -> User | None:
+    """Single UPDATE ... RETURNING, None if no user matched."""
+    query = await db.execute(
+        update(User)
+        .where(where)
+        .values(**values)
+        .returning(User)
+        .execution_options(synchronize_session=False)
+    )
+    user = query.scalar_one_or_none()
+    await db.commit()
+    if user is not None:
+        await recent_writes.mark_recent_write(user.user_id)
+    return user
+
+
 async def authenticate_user(user: UserLogin, db: AsyncSession) -> User | None:
     try:
-        query = await db.execute(select(User).where(User.email == user.email))
+        query = await db.execute(
+            select(User).where(User.email == user.email, User.deleted_at.is_(None))
+        )
         existing_user = query.scalar_one_or_none()
-        if existing_user and verify_password(user.password, existing_user.password):
+        if existing_user and await verify_password_async(user.password, existing_user.password):
             return existing_user
         return None
+    except PasswordHasherBusy:
+        raise
     except Exception as error:
         logger.error(f"Error during login: {error}")
         return None
@@ -58,13 +97,11 @@ async def authenticate_user(user: UserLogin, db: AsyncSession) -> User | None:
 
 async def add_avatar(user_id: UUID, avatar_url: str, db: AsyncSession) -> User | None:
     try:
-        user = await find_user_by_id(user_id=user_id, db=db)
-        if user:
-            user.avatar_url = avatar_url
-            await db.commit()
-            await db.refresh(user)
-            return user
-        return None
+        user = await _update_user(
+            (User.user_id == user_id) & User.deleted_at.is_(None), {"avatar_url": avatar_url}, db
+        )
+        await generation.bump_generation(AVATAR_NAMESPACE, user_id)
+        return user
     except Exception as error:
         await db.rollback()
         logger.error(f"Cannot insert avatar into db: {error}")
@@ -73,13 +110,11 @@ async def add_avatar(user_id: UUID, avatar_url: str, db: AsyncSession) -> User |
 
 async def delete_avatar_database(user_id: UUID, db: AsyncSession) -> User | None:
     try:
-        user = await find_user_by_id(user_id=user_id, db=db)
-        if user:
-            user.avatar_url = None
-            await db.commit()
-            await db.refresh(user)
-            return user
-        return None
+        user = await _update_user(
+            (User.user_id == user_id) & User.deleted_at.is_(None), {"avatar_url": None}, db
+        )
+        await generation.bump_generation(AVATAR_NAMESPACE, user_id)
+        return user
     except Exception as error:
         await db.rollback()
         logger.error(f"Cannot delete avatar from db: {error}")
@@ -88,10 +123,10 @@ async def delete_avatar_database(user_id: UUID, db: AsyncSession) -> User | None
 
 async def get_avatar(user_id: UUID, db: AsyncSession) -> str | None:
     try:
-        user = await find_user_by_id(user_id=user_id, db=db)
-        if user:
-            return user.avatar_url
-        return None
+        query = await db.execute(
+            select(User.avatar_url).where(User.user_id == user_id)
+        )
+        return query.scalar_one_or_none()
     except Exception as error:
         logger.error(f"Error during avatar retrieval: {error}")
         raise error
@@ -99,15 +134,61 @@ async def get_avatar(user_id: UUID, db: AsyncSession) -> str | None:
 
 async def verify_user(email: str, db: AsyncSession) -> User | None:
     try:
-        query = await db.execute(select(User).where(User.email == email))
-        user = query.scalar_one_or_none()
-        if user:
-            user.is_verified = True
-            await db.commit()
-            await db.refresh(user)
-            return user
-        return None
+        return await _update_user(
+            (User.email == email) & User.deleted_at.is_(None), {"is_verified": True}, db
+        )
     except Exception as error:
         await db.rollback()
         logger.error(f"Error verifying user: {error}")
         raise error
+
+
+async def mark_user_deleted(user_id: UUID, db: AsyncSession) -> User | None:
+    """
+    Closes the account at once and revokes its tokens, its data is purged
+    later by purge_deleted_user. None if the user does not exist or is
+    already deleted.
+    """
+    try:
+        user = await _update_user(
+            (User.user_id == user_id) & User.deleted_at.is_(None),
+            {"deleted_at": func.now()},
+            db
+        )
+        if user is not None:
+            await revoked_users.revoke_user_tokens(user_id)
+        return user
+    except Exception as error:
+        await db.rollback()
+        logger.error(f"Cannot mark user {user_id} deleted: {error}")
+        raise error
+
+
+async def find_deleted_user(user_id: UUID, db: AsyncSession) -> User | None:
+    query = await db.execute(
+        select(User).where(User.user_id == user_id, User.deleted_at.is_not(None))
+    )
+    return query.scalar_one_or_none()
+
+
+async def remove_deleted_user(user_id: UUID, db: AsyncSession) -> bool:
+    """Deletes the row of a deleted account, its remaining tasks go by ON DELETE CASCADE."""
+    query = await db.execute(
+        delete(User)
+        .where(User.user_id == user_id, User.deleted_at.is_not(None))
+        .returning(User.user_id)
+    )
+    removed = query.scalar_one_or_none() is not None
+    await db.commit()
+    return removed
+
+
+async def get_unpurged_user_ids(deleted_before: datetime, db: AsyncSession, limit: int = 100) -> List[UUID]:
+    """Deleted accounts whose purge should have finished by now (served by ix_users_deleted_at)."""
+    query = await db.execute(
+        select(User.user_id)
+        .where(User.deleted_at.is_not(None), User.deleted_at < deleted_before)
+        .order_by(User.deleted_at)
+        .limit(limit)
+    )
+    return list(query.scalars().all())
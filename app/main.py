@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database.database import DeclarativeBase, postgresql_engine
+from app.database.database import postgresql_engine, warm_up_engines, dispose_engines
+from app.database.schema import check_schema_revision
 from contextlib import asynccontextmanager
 from app.routers.healthcheck import health_router
 from app.routers.user import user_router
@@ -8,18 +9,23 @@ from app.routers.task import tasks_router
 from app.middleware.logging import LoggingMiddleware, ErrorHandlingMiddleware
 from app.middleware.rate_limiter import RateLimitMiddleware
 from app.redis_client import redis_client
+from app.database import task as task_db
+from app.config import TASK_WRITER_CONFIG
 from loguru import logger
 import os
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with postgresql_engine.begin() as connection:
-        await connection.run_sync(DeclarativeBase.metadata.create_all)
-        logger.debug(f"Tables in metadata: {DeclarativeBase.metadata.tables.keys()}")
-        logger.info(f"App is running in Development mode: {os.getenv('DEVELOPMENT_MODE')}")
-        yield
-    await postgresql_engine.dispose()
+    revision = await check_schema_revision(postgresql_engine)
+    logger.info(f"Database schema at revision {revision}")
+    logger.info(f"App is running in Development mode: {os.getenv('DEVELOPMENT_MODE')}")
+    await warm_up_engines()
+    if TASK_WRITER_CONFIG.enabled:
+        task_db.task_writer.start()
+    yield
+    await task_db.task_writer.stop()
+    await dispose_engines()
 
 
 # App core
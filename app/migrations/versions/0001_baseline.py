@@ -0,0 +1,59 @@
+"""Baseline schema: users and task
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+Databases created by the former Base.metadata.create_all() at startup
+already hold these tables, IF NOT EXISTS lets them upgrade in place.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0001_baseline"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("user_id", sa.Uuid(), primary_key=True, comment="Unique identifier for the user"),
+        sa.Column("password", sa.String(500), nullable=False, comment="Hashed password"),
+        sa.Column("username", sa.String(50), nullable=False, unique=True, comment="Unique username"),
+        sa.Column("avatar_url", sa.String(255), nullable=True, comment="URL to user avatar image"),
+        sa.Column("email", sa.String(150), nullable=False, unique=True, comment="User email"),
+        sa.Column(
+            "is_verified", sa.Boolean(), nullable=False,
+            server_default=sa.text("false"), comment="Is user verified"
+        ),
+        if_not_exists=True
+    )
+    op.create_table(
+        "task",
+        sa.Column("task_id", sa.Uuid(), primary_key=True, comment="Unique identifier for the task"),
+        sa.Column("title", sa.String(150), nullable=False, comment="Task title"),
+        sa.Column("description", sa.Text(), nullable=True, comment="Detailed task description"),
+        sa.Column(
+            "created_at", sa.TIMESTAMP(timezone=True), nullable=False,
+            comment="Task creation timestamp"
+        ),
+        sa.Column(
+            "appointed_at", sa.TIMESTAMP(timezone=True), nullable=True,
+            comment="Scheduled completion time"
+        ),
+        sa.Column(
+            "user_fk", sa.Uuid(),
+            sa.ForeignKey("users.user_id", ondelete="CASCADE"),
+            nullable=False, comment="Foreign key to user"
+        ),
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task")
+    op.drop_table("users")
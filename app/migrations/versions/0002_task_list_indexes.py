@@ -0,0 +1,36 @@
+"""Indexes behind task list pagination, due-date filters and sorting
+
+Revision ID: 0002_task_list_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18 09:05:00
+
+Built CONCURRENTLY so writes to task keep flowing during the build, which
+cannot run inside a transaction, hence the autocommit blocks. A failed
+concurrent build leaves an INVALID index behind, drop it before retrying.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0002_task_list_indexes"
+down_revision: Union[str, None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_task_user_created", "task", ["user_fk", "created_at", "task_id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_task_user_appointed", "task", ["user_fk", "appointed_at", "task_id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_task_user_appointed", "task", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_task_user_created", "task", postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,47 @@
+"""Full-text search column and GIN index on task
+
+Revision ID: 0003_task_search_vector
+Revises: 0002_task_list_indexes
+Create Date: 2026-10-18 09:10:00
+
+A stored generated column is computed for every existing row, so adding it
+rewrites the task table under an exclusive lock: run it off-peak on large
+tables. The GIN index is then built without blocking writes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+revision: str = "0003_task_search_vector"
+down_revision: Union[str, None] = "0002_task_list_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "task",
+        sa.Column(
+            "search_vector",
+            TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))",
+                persisted=True
+            ),
+            comment="Full-text search document of title and description"
+        ),
+        if_not_exists=True
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_task_search_vector", "task", ["search_vector"],
+            postgresql_using="gin", postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_task_search_vector", "task", postgresql_concurrently=True, if_exists=True)
+    op.drop_column("task", "search_vector")
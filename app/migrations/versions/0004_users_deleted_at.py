@@ -0,0 +1,40 @@
+"""Soft deletion of accounts awaiting their purge
+
+Revision ID: 0004_users_deleted_at
+Revises: 0003_task_search_vector
+Create Date: 2026-10-18 09:15:00
+
+A nullable column without default is a catalog-only change, no rewrite.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0004_users_deleted_at"
+down_revision: Union[str, None] = "0003_task_search_vector"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "deleted_at", sa.TIMESTAMP(timezone=True), nullable=True,
+            comment="Set when the account is deleted, the row goes once its data is purged"
+        ),
+        if_not_exists=True
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_deleted_at", "users", ["deleted_at"],
+            postgresql_where=sa.text("deleted_at IS NOT NULL"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_users_deleted_at", "users", postgresql_concurrently=True, if_exists=True)
+    op.drop_column("users", "deleted_at")
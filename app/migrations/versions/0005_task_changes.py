@@ -0,0 +1,59 @@
+"""Last-write time of tasks and tombstones of deleted ones, for delta sync
+
+Revision ID: 0005_task_changes
+Revises: 0004_users_deleted_at
+Create Date: 2026-10-18 09:20:00
+
+A column with a non-volatile default is a catalog-only change since
+Postgres 11: existing rows read now() as of the migration, no rewrite.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0005_task_changes"
+down_revision: Union[str, None] = "0004_users_deleted_at"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "task",
+        sa.Column(
+            "updated_at", sa.TIMESTAMP(timezone=True), nullable=False,
+            server_default=sa.func.now(), comment="Last write to the task"
+        ),
+        if_not_exists=True
+    )
+    op.create_table(
+        "task_tombstone",
+        sa.Column("task_id", sa.Uuid(), primary_key=True, comment="Identifier of the deleted task"),
+        sa.Column(
+            "user_fk", sa.Uuid(),
+            sa.ForeignKey("users.user_id", ondelete="CASCADE"),
+            nullable=False, comment="Owner of the deleted task"
+        ),
+        sa.Column(
+            "deleted_at", sa.TIMESTAMP(timezone=True), nullable=False,
+            server_default=sa.func.now(), comment="Deletion time"
+        ),
+        if_not_exists=True
+    )
+    op.create_index(
+        "ix_task_tombstone_user_deleted", "task_tombstone", ["user_fk", "deleted_at", "task_id"],
+        if_not_exists=True
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_task_user_updated", "task", ["user_fk", "updated_at", "task_id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_task_user_updated", "task", postgresql_concurrently=True, if_exists=True)
+    op.drop_table("task_tombstone")
+    op.drop_column("task", "updated_at")
@@ -0,0 +1,86 @@
+"""Per-user rollup of tasks by creation day, kept by triggers on task
+
+Revision ID: 0006_task_daily_stats
+Revises: 0005_task_changes
+Create Date: 2026-10-18 09:25:00
+
+Statement-level triggers fold each INSERT, COPY or DELETE into one upsert
+per (user, day) through the transition tables, in the writing transaction.
+Rows are locked in key order so concurrent multi-user writes cannot deadlock.
+Deletes cascading from a deleted user skip the rollup, which cascades too.
+
+Creating the triggers locks task against writes until commit, which keeps
+the backfill exact: no write can slip between the two. The backfill reads
+the whole table, run it off-peak on large ones.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0006_task_daily_stats"
+down_revision: Union[str, None] = "0005_task_changes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_UPSERT = """
+    INSERT INTO task_daily_stats AS stats (user_fk, day, created)
+    SELECT user_fk, (created_at AT TIME ZONE 'UTC')::date, {sign}count(*)
+    FROM {rows}
+    {where}
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    ON CONFLICT (user_fk, day) DO UPDATE SET created = stats.created + excluded.created
+"""
+
+_TRIGGERS = (
+    (
+        "task_daily_stats_insert", "INSERT", "NEW TABLE AS new_tasks",
+        _UPSERT.format(sign="", rows="new_tasks", where="")
+    ),
+    (
+        "task_daily_stats_delete", "DELETE", "OLD TABLE AS old_tasks",
+        _UPSERT.format(
+            sign="-", rows="old_tasks",
+            where="WHERE EXISTS (SELECT 1 FROM users WHERE users.user_id = old_tasks.user_fk)"
+        )
+    ),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_daily_stats",
+        sa.Column(
+            "user_fk", sa.Uuid(),
+            sa.ForeignKey("users.user_id", ondelete="CASCADE"),
+            primary_key=True, comment="Owner of the tasks"
+        ),
+        sa.Column("day", sa.Date(), primary_key=True, comment="Creation day of the tasks (UTC)"),
+        sa.Column("created", sa.Integer(), nullable=False, comment="Existing tasks created that day"),
+        if_not_exists=True
+    )
+    for name, event, transition, body in _TRIGGERS:
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                {body.strip()};
+                RETURN NULL;
+            END
+            $$
+        """)
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON task")
+        op.execute(f"""
+            CREATE TRIGGER {name} AFTER {event} ON task
+            REFERENCING {transition}
+            FOR EACH STATEMENT EXECUTE FUNCTION {name}()
+        """)
+    op.execute("DELETE FROM task_daily_stats")
+    op.execute(_UPSERT.format(sign="", rows="task", where=""))
+
+
+def downgrade() -> None:
+    for name, _, _, _ in _TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON task")
+        op.execute(f"DROP FUNCTION IF EXISTS {name}()")
+    op.drop_table("task_daily_stats")
@@ -1,8 +1,9 @@
 from app.database import DeclarativeBase
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import String, Text, TIMESTAMP, ForeignKey, Index, Computed, text, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from uuid import UUID, uuid4
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import TYPE_CHECKING    # noqa: TYP001
 
 if TYPE_CHECKING:
@@ -11,6 +12,15 @@ if TYPE_CHECKING:
 
 class Task(DeclarativeBase):
     __tablename__ = "task"
+    __table_args__ = (
+        # Serves keyset pagination of a user's tasks ordered by creation time
+        Index("ix_task_user_created", "user_fk", "created_at", "task_id"),
+        # Serves due-date ranges (upcoming / overdue) and sorting by due time
+        Index("ix_task_user_appointed", "user_fk", "appointed_at", "task_id"),
+        Index("ix_task_search_vector", "search_vector", postgresql_using="gin"),
+        # Serves delta sync (GET /task/changes) in keyset order
+        Index("ix_task_user_updated", "user_fk", "updated_at", "task_id"),
+    )
 
     task_id: Mapped[UUID] = mapped_column(
         primary_key=True,
@@ -38,6 +48,24 @@ class Task(DeclarativeBase):
         nullable=True,
         comment="Scheduled completion time"
     )
+    # now() is the start of the writing transaction, see get_task_changes
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        comment="Last write to the task"
+    )
+
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))",
+            persisted=True
+        ),
+        deferred=True,
+        comment="Full-text search document of title and description"
+    )
 
     user_fk: Mapped[UUID] = mapped_column(
         ForeignKey("users.user_id", ondelete="CASCADE"),
@@ -51,8 +79,61 @@ class Task(DeclarativeBase):
     )
 
 
+class TaskTombstone(DeclarativeBase):
+    """Trace of a deleted task, kept for TOMBSTONE_RETENTION so delta sync can report it."""
+    __tablename__ = "task_tombstone"
+    __table_args__ = (
+        Index("ix_task_tombstone_user_deleted", "user_fk", "deleted_at", "task_id"),
+    )
+
+    task_id: Mapped[UUID] = mapped_column(
+        primary_key=True,
+        comment="Identifier of the deleted task"
+    )
+    user_fk: Mapped[UUID] = mapped_column(
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Owner of the deleted task"
+    )
+    deleted_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="Deletion time"
+    )
+
+
+class TaskDailyStats(DeclarativeBase):
+    """
+    Tasks of a user by creation day (UTC). Maintained by statement-level
+    triggers on task in the writing transaction, see migration 0006.
+    """
+    __tablename__ = "task_daily_stats"
+
+    user_fk: Mapped[UUID] = mapped_column(
+        ForeignKey("users.user_id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="Owner of the tasks"
+    )
+    day: Mapped[date] = mapped_column(
+        primary_key=True,
+        comment="Creation day of the tasks (UTC)"
+    )
+    created: Mapped[int] = mapped_column(
+        nullable=False,
+        comment="Existing tasks created that day"
+    )
+
+
 class User(DeclarativeBase):
     __tablename__ = "users"
+    __table_args__ = (
+        # Only accounts awaiting their purge are indexed
+        Index(
+            "ix_users_deleted_at", "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL")
+        ),
+    )
 
     user_id: Mapped[UUID] = mapped_column(
         primary_key=True,
@@ -87,10 +168,18 @@ class User(DeclarativeBase):
         comment="Is user verified",
         server_default='false'
     )
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=True,
+        comment="Set when the account is deleted, the row goes once its data is purged"
+    )
 
+    # passive_deletes: ON DELETE CASCADE removes the tasks in Postgres,
+    # deleting a user never loads them into the session
     tasks: Mapped[list["Task"]] = relationship(
         "Task",
         back_populates="user",
         lazy="select",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
@@ -5,6 +5,9 @@ from fastapi.exceptions import HTTPException
 from loguru import logger
 from app.s3_client import s3_client
 from app.redis_client import redis_session
+from app.database import database
+from app.database.pool import pool_stats
+from app.utils.password_manager import password_hasher
 
 
 health_router = APIRouter(prefix="/health")
@@ -59,3 +62,19 @@ async def redis_healthcheck():
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             content={"status": "unhealthy", "detail": str(error)}
         )
+
+
+@health_router.get("/db_pool", description="Connection pool usage and acquire wait times")
+async def db_pool_stats():
+    return JSONResponse(
+        content={
+            "primary": pool_stats(database.postgresql_engine),
+            "replicas": [pool_stats(engine) for engine in database.replica_engines]
+        },
+        status_code=status.HTTP_200_OK
+    )
+
+
+@health_router.get("/password_hasher", description="bcrypt pool usage, queue wait times and rejections")
+async def password_hasher_stats():
+    return JSONResponse(content=password_hasher.stats(), status_code=status.HTTP_200_OK)
@@ -1,31 +1,153 @@
-from fastapi import status, Depends, HTTPException, APIRouter, Query
+from fastapi import status, Depends, HTTPException, APIRouter, Query, Request, Header
 from fastapi_utils.cbv import cbv
-from fastapi.responses import JSONResponse
-from app.database.database import get_db, AsyncSession
+from fastapi.responses import ORJSONResponse, StreamingResponse, Response
+from sqlalchemy.orm import sessionmaker
+from app.database.database import get_authed_db, get_read_db, get_read_session_factory, AsyncSession
 from app.database import task as task_db
 from app.utils.oauth2Schema import get_current_user_id
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskBatchCreate,
+    TaskBatchUpdate,
+    TaskBatchDelete,
+    TaskFilter,
+    TaskFields,
+    TASK_FIELDS
+)
 from app.schemas.responses import (
     TaskCreateResponse,
-    TaskUpdateResponse
+    TaskUpdateResponse,
+    TaskBatchItemResult,
+    TaskBatchCreateResponse,
+    TaskBatchChangeResponse,
+    TaskImportResponse,
+    TaskResponse,
+    TaskListResponse,
+    TaskSearchResponse,
+    TaskChangesResponse,
+    TaskStatsResponse
 )
+from pydantic import ValidationError
+from app.utils.cursor import encode_cursor, decode_cursor
+from app.utils.etag import make_etag, etag_matches, not_modified
+from app.core import task_import
+from app.cache import task_cache, generation, page_cache, task_events
 from loguru import logger
 from uuid import UUID
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional, List, Tuple, AsyncIterator    # noqa: TYP001
+import csv
+import io
+import json
+import orjson
+
+
+tasks_router = APIRouter(
+    prefix="/task",
+    tags=["Task"],
+    default_response_class=ORJSONResponse
+)
+
+# Rows buffered before a chunk is flushed to the client
+EXPORT_FLUSH_ROWS = 500
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+# Events a slow /task/events client may fall behind by before it is told to resync
+EVENTS_BUFFER_SIZE = 100
+# Idle seconds between keep-alive comments on /task/events
+EVENTS_HEARTBEAT_SECONDS = 15
+# How far behind the database clock a /task/changes window ends, see task_db.get_changes_horizon
+CHANGES_SETTLE = timedelta(seconds=5)
+# Keyset position before any task, where a sync without token starts
+CHANGES_ORIGIN = (datetime(1970, 1, 1, tzinfo=timezone.utc), UUID(int=0))
+# Sorts after every task_id: a completed window resumes past all rows at its end time
+CHANGES_MAX_TASK_ID = UUID(int=2 ** 128 - 1)
+
+
+def _validation_errors(error: ValidationError) -> list:
+    return [
+        {
+            "field": ".".join(str(part) for part in item["loc"]),
+            "message": item["msg"]
+        }
+        for item in error.errors(include_url=False, include_context=False)
+    ]
+
+
+def _batch_change_response(
+    message: str,
+    requested_ids: List[UUID],
+    changed_ids: List[UUID]
+) -> dict:
+    changed = set(changed_ids)
+    return TaskBatchChangeResponse(
+        message=message,
+        task_ids=[str(task_id) for task_id in requested_ids if task_id in changed],
+        not_found=[str(task_id) for task_id in requested_ids if task_id not in changed]
+    ).model_dump()
+
 
+def _json_value(value):
+    # asyncpg returns its own uuid.UUID subclass, which orjson refuses
+    return str(value) if isinstance(value, UUID) else value
 
-tasks_router = APIRouter(prefix="/task", tags=["Task"])
+
+def _serialize_task(task, fields: Tuple[str, ...] = TASK_FIELDS) -> dict:
+    # Datetimes stay native, orjson encodes them in C.
+    # Only `fields` are read, the others may not have been loaded at all
+    return {field: _json_value(getattr(task, field)) for field in fields}
+
+
+def _invalid_fields(error: ValidationError) -> ORJSONResponse:
+    return ORJSONResponse(
+        {"message": "Invalid fields", "errors": _validation_errors(error)},
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+    )
+
+
+def _changes_token(after: Tuple[datetime, UUID], until: Optional[datetime], floor: Optional[datetime]) -> str:
+    """
+    Sync token: keyset position `after`, end of the window in progress (None
+    between windows) and `floor`, the time from which deletions must still
+    be on record (None for a full sync, which needs no deletions).
+    """
+    return encode_cursor(
+        after[0].isoformat(), str(after[1]),
+        until.isoformat() if until else None,
+        floor.isoformat() if floor else None
+    )
+
+
+def _decode_changes_token(
+    since: str
+) -> Tuple[Tuple[datetime, UUID], Optional[datetime], Optional[datetime]]:
+    """Inverse of _changes_token, raises ValueError (or TypeError) on a malformed token."""
+    after_ts, after_id, until, floor = decode_cursor(since, size=4)
+    return (
+        (datetime.fromisoformat(after_ts), UUID(after_id)),
+        datetime.fromisoformat(until) if until else None,
+        datetime.fromisoformat(floor) if floor else None
+    )
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
 
 
 @cbv(tasks_router)
 class TaskViews:
-    db: AsyncSession = Depends(get_db)
+    # Resolved before any endpoint parameter: authenticates first, then opens the session
+    db: AsyncSession = Depends(get_authed_db)
 
-    @tasks_router.post("/", summary="Create task")
+    @tasks_router.post("/", summary="Create task", response_model=TaskCreateResponse)
     async def create_task_endpoint(
         self,
         task_data: TaskCreate,
         token=Depends(get_current_user_id)
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         logger.info(f"Creating task for user {token}: {task_data.title}")
         try:
             created_task_id = await task_db.create_task(
@@ -39,13 +161,13 @@ class TaskViews:
                     message="Task created successfully",
                     task_id=str(created_task_id)
                 )
-                return JSONResponse(
+                return ORJSONResponse(
                     response.model_dump(),
                     status_code=status.HTTP_201_CREATED
                 )
             else:
                 logger.warning(f"Task creation failed for user {token}")
-                return JSONResponse(
+                return ORJSONResponse(
                     {"message": "Task creation failed"},
                     status_code=status.HTTP_400_BAD_REQUEST
                 )
@@ -54,55 +176,215 @@ class TaskViews:
             raise
         except Exception as error:
             logger.error(f"Unexpected error during task creation: {error}")
-            return JSONResponse(
+            return ORJSONResponse(
+                {"message": "Internal server error"},
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @tasks_router.post("/batch", summary="Create many tasks at once", response_model=TaskBatchCreateResponse)
+    async def create_tasks_batch_endpoint(
+        self,
+        batch: TaskBatchCreate,
+        token=Depends(get_current_user_id)
+    ) -> ORJSONResponse:
+        logger.info(f"Creating {len(batch.tasks)} tasks for user {token}")
+        results = [None] * len(batch.tasks)
+        valid_tasks, valid_indexes = [], []
+        for index, item in enumerate(batch.tasks):
+            try:
+                valid_tasks.append(TaskCreate.model_validate(item))
+                valid_indexes.append(index)
+            except ValidationError as error:
+                results[index] = TaskBatchItemResult(
+                    index=index, errors=_validation_errors(error)
+                )
+
+        if not valid_tasks:
+            logger.warning(f"Batch of user {token} has no valid tasks")
+            return ORJSONResponse(
+                TaskBatchCreateResponse(
+                    message="No valid tasks in batch",
+                    created=0,
+                    results=results
+                ).model_dump(),
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            created_ids = await task_db.create_tasks(
+                tasks=valid_tasks,
+                user_id=token,
+                db=self.db
+            )
+        except Exception as error:
+            logger.error(f"Unexpected error during batch task creation: {error}")
+            created_ids = None
+        if created_ids is None or len(created_ids) != len(valid_tasks):
+            logger.warning(f"Batch task creation failed for user {token}")
+            return ORJSONResponse(
+                {"message": "Batch task creation failed"},
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        for index, task_id in zip(valid_indexes, created_ids):
+            results[index] = TaskBatchItemResult(index=index, task_id=str(task_id))
+        logger.info(f"Created {len(created_ids)} tasks for user {token}")
+        return ORJSONResponse(
+            TaskBatchCreateResponse(
+                message="Tasks created",
+                created=len(created_ids),
+                results=results
+            ).model_dump(),
+            status_code=status.HTTP_201_CREATED
+        )
+
+    @tasks_router.post(
+        "/import",
+        summary="Bulk import tasks from NDJSON or CSV",
+        description="Chunks are committed as the body streams in, but their reports are "
+                    "returned together once the upload ends. For progress while it runs, "
+                    "use the command line: python -m app.core.task_import",
+        response_model=TaskImportResponse
+    )
+    async def import_tasks_endpoint(
+        self,
+        request: Request,
+        token=Depends(get_current_user_id),
+        import_format: Literal["ndjson", "csv"] = Query(
+            "ndjson", alias="format", description="ndjson or csv"
+        ),
+        chunk_size: int = Query(
+            task_import.DEFAULT_CHUNK_SIZE, ge=100, le=10000,
+            description="Rows validated and copied per transaction"
+        )
+    ) -> ORJSONResponse:
+        logger.info(f"Importing {import_format} tasks for user {token}")
+        try:
+            # The body is consumed as it arrives, never buffered as a whole
+            reports = await task_import.import_tasks(
+                request.stream(),
+                import_format,
+                UUID(str(token)),
+                self.db,
+                chunk_size=chunk_size
+            )
+        except Exception as error:
+            logger.error(f"Unexpected error during task import: {error}")
+            return ORJSONResponse(
+                {"message": "Internal server error"},
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        response = TaskImportResponse(
+            message="Import finished",
+            imported=sum(report.imported for report in reports),
+            failed=sum(report.failed for report in reports),
+            chunks=reports
+        )
+        logger.info(f"Imported {response.imported} tasks for user {token}, {response.failed} failed")
+        return ORJSONResponse(response.model_dump(), status_code=status.HTTP_200_OK)
+
+    @tasks_router.patch(
+        "/batch",
+        summary="Apply the same changes to many tasks",
+        response_model=TaskBatchChangeResponse
+    )
+    async def update_tasks_batch_endpoint(
+        self,
+        batch: TaskBatchUpdate,
+        token=Depends(get_current_user_id)
+    ) -> ORJSONResponse:
+        logger.info(f"Updating {len(batch.task_ids)} tasks for user {token}")
+        if not batch.changes.model_dump(exclude_unset=True):
+            return ORJSONResponse(
+                {"message": "No changes provided"},
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            updated_ids = await task_db.update_tasks(
+                task_ids=batch.task_ids,
+                task_update_data=batch.changes,
+                user_id=token,
+                db=self.db
+            )
+        except Exception as error:
+            logger.error(f"Unexpected error during batch task update: {error}")
+            updated_ids = None
+        if updated_ids is None:
+            return ORJSONResponse(
                 {"message": "Internal server error"},
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+        logger.info(f"Updated {len(updated_ids)} tasks for user {token}")
+        return ORJSONResponse(
+            _batch_change_response("Tasks updated", batch.task_ids, updated_ids),
+            status_code=status.HTTP_200_OK
+        )
+
+    @tasks_router.delete("/batch", summary="Delete many tasks", response_model=TaskBatchChangeResponse)
+    async def delete_tasks_batch_endpoint(
+        self,
+        batch: TaskBatchDelete,
+        token=Depends(get_current_user_id)
+    ) -> ORJSONResponse:
+        logger.info(f"Deleting {len(batch.task_ids)} tasks for user {token}")
+        try:
+            deleted_ids = await task_db.remove_tasks(
+                task_ids=batch.task_ids,
+                user_id=token,
+                db=self.db
+            )
+        except Exception as error:
+            logger.error(f"Unexpected error during batch task deletion: {error}")
+            deleted_ids = None
+        if deleted_ids is None:
+            return ORJSONResponse(
+                {"message": "Internal server error"},
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        logger.info(f"Deleted {len(deleted_ids)} tasks for user {token}")
+        return ORJSONResponse(
+            _batch_change_response("Tasks deleted", batch.task_ids, deleted_ids),
+            status_code=status.HTTP_200_OK
+        )
 
-    @tasks_router.patch("/{task_id}", summary="Changing task parameter")
+    @tasks_router.patch("/{task_id}", summary="Changing task parameter", response_model=TaskUpdateResponse)
     async def update_task_endpoint(
         self,
         task_id: UUID,
         task: TaskUpdate,
         token=Depends(get_current_user_id)
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         logger.info(f"Updating task {task_id} for user {token}")
         try:
-            existing_task = await task_db.get_task_by_id(
+            updated_task = await task_db.update_task_by_id(
                 task_id=task_id,
+                task_update_data=task,
                 user_id=token,
                 db=self.db
             )
-            if existing_task:
-                updated_task = await task_db.update_task_by_id(
-                    task_id=task_id,
-                    task_update_data=task,
-                    user_id=token,
-                    db=self.db
-                )
-                if updated_task:
-                    logger.info(f"Task {task_id} updated successfully")
-                    response = TaskUpdateResponse(
-                        message="Update successful",
-                        task_id=str(updated_task.task_id),
-                        new_title=updated_task.title if task.title else None,
-                        new_description=(
-                            updated_task.description
-                            if task.description else None
-                        ),
-                        new_appointed_at=(
-                            updated_task.appointed_at.isoformat()
-                            if updated_task.appointed_at else None
-                        )
-                    )
-                    return JSONResponse(
-                        response.model_dump(),
-                        status_code=status.HTTP_200_OK
+            if updated_task:
+                logger.info(f"Task {task_id} updated successfully")
+                response = TaskUpdateResponse(
+                    message="Update successful",
+                    task_id=str(updated_task.task_id),
+                    new_title=updated_task.title if task.title else None,
+                    new_description=(
+                        updated_task.description
+                        if task.description else None
+                    ),
+                    new_appointed_at=(
+                        updated_task.appointed_at.isoformat()
+                        if updated_task.appointed_at else None
                     )
+                )
+                return ORJSONResponse(
+                    response.model_dump(),
+                    status_code=status.HTTP_200_OK
+                )
             logger.warning(
                 f"Task {task_id} not found or update failed for user {token}"
             )
-            return JSONResponse(
+            return ORJSONResponse(
                 {"message": "Task not found or update failed"},
                 status_code=status.HTTP_400_BAD_REQUEST
             )
@@ -111,7 +393,7 @@ class TaskViews:
             raise
         except Exception as error:
             logger.error(f"Unexpected error during task update: {error}")
-            return JSONResponse(
+            return ORJSONResponse(
                 {"message": "Internal server error"},
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
@@ -121,7 +403,7 @@ class TaskViews:
         self,
         task_id: UUID,
         token=Depends(get_current_user_id),
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         logger.info(f"Deleting task {task_id} for user {token}")
         try:
             deleted = await task_db.remove_task(
@@ -131,46 +413,171 @@ class TaskViews:
             )
             if deleted:
                 logger.info(f"Task {task_id} deleted successfully")
-                return JSONResponse(
+                return ORJSONResponse(
                     {"message": "Task deleted successfully"},
                     status_code=status.HTTP_200_OK,
                 )
             logger.warning(f"Task {task_id} not found for user {token}")
-            return JSONResponse(
+            return ORJSONResponse(
                 {"message": "Task not found"},
                 status_code=status.HTTP_404_NOT_FOUND,
             )
         except HTTPException as error:
             logger.error(f"HTTP error during task deletion: {error}")
-            return JSONResponse(
+            return ORJSONResponse(
                 {"message": "Internal server error"},
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
         except Exception as error:
             logger.error(f"Unexpected error during task deletion: {error}")
             print(f"DEBUG_TASK_ERROR: {error}")
-            return JSONResponse(
+            return ORJSONResponse(
                 {"message": "Internal server error"},
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    @tasks_router.get("/", summary="Get all tasks of user")
+    @tasks_router.get("/", summary="Get all tasks of user", response_model=TaskListResponse)
     async def get_tasks_endpoint(
         self,
         token=Depends(get_current_user_id),
+        read_db: AsyncSession = Depends(get_read_db),
         page: int = Query(1, ge=1, description="Page number"),
         size: int = Query(
             10, ge=1, le=100, description="Number of tasks per page"
+        ),
+        pagination: Literal["page", "cursor"] = Query(
+            "page",
+            description="'page' for numbered pages, 'cursor' for keyset pagination"
+        ),
+        cursor: Optional[str] = Query(
+            None,
+            description="next_cursor from the previous page (implies cursor pagination)"
+        ),
+        include_total: bool = Query(
+            False,
+            description="Count all tasks of the user (cursor pagination only)"
+        ),
+        due_after: Optional[datetime] = Query(
+            None, description="Only tasks due at or after this time"
+        ),
+        due_before: Optional[datetime] = Query(
+            None, description="Only tasks due before this time"
+        ),
+        overdue: bool = Query(
+            False, description="Only tasks whose due time has passed"
+        ),
+        sort: Literal["created_at", "-created_at", "appointed_at", "-appointed_at"] = Query(
+            "created_at",
+            description="Sort column, '-' prefix for descending. "
+                        "Sorting by appointed_at lists only tasks that have one"
+        ),
+        fields: Optional[str] = Query(
+            None,
+            description="Comma separated task fields to return, e.g. title,appointed_at. "
+                        "task_id is always included"
+        ),
+        if_none_match: Optional[str] = Header(None)
+    ) -> Response:
+        try:
+            filters = TaskFilter(
+                due_after=due_after,
+                due_before=due_before,
+                overdue=overdue,
+                sort=sort
+            )
+        except ValidationError as error:
+            return ORJSONResponse(
+                {"message": "Invalid filters", "errors": _validation_errors(error)},
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+        try:
+            projection = TaskFields(fields=fields)
+        except ValidationError as error:
+            return _invalid_fields(error)
+        by_cursor = pagination == "cursor" or cursor is not None
+        page_params = {
+            "size": size,
+            "filters": filters.model_dump(mode="json"),
+            "fields": list(projection.fields),
+            **(
+                {"cursor": cursor, "include_total": include_total}
+                if by_cursor else {"page": page}
+            )
+        }
+
+        # Read before querying Postgres: a write landing in between bumps the
+        # generation, so the page built here can only be cached under the old one.
+        # Overdue pages change with the clock alone and are never versioned.
+        tasks_generation = None
+        if not filters.overdue:
+            tasks_generation = await generation.get_generation(task_db.TASKS_NAMESPACE, token)
+        etag = None
+        if tasks_generation is not None:
+            etag = make_etag(tasks_generation, json.dumps(page_params, sort_keys=True))
+            cached_response = await self._cached_tasks_page(
+                token, tasks_generation, page_params, etag, if_none_match
+            )
+            if cached_response is not None:
+                return cached_response
+
+        if by_cursor:
+            response = await self._get_tasks_by_cursor(
+                read_db, token, size, cursor, include_total, filters, projection
+            )
+        else:
+            response = await self._get_tasks_by_page(
+                read_db, token, page, size, filters, projection
+            )
+        if tasks_generation is not None and response.status_code == status.HTTP_200_OK:
+            await page_cache.store_page(
+                token, tasks_generation, page_params, response.body.decode("utf-8")
+            )
+            response.headers["ETag"] = etag
+        return response
+
+    async def _cached_tasks_page(
+        self,
+        token: str,
+        tasks_generation: str,
+        page_params: dict,
+        etag: str,
+        if_none_match: Optional[str]
+    ) -> Optional[Response]:
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        cached_page = await page_cache.get_page(token, tasks_generation, page_params)
+        if cached_page is None:
+            return None
+        logger.info(f"Serving cached task page for user {token}")
+        return Response(
+            cached_page,
+            media_type="application/json",
+            status_code=status.HTTP_200_OK,
+            headers={"ETag": etag}
         )
-    ) -> JSONResponse:
+
+    async def _get_tasks_by_page(
+        self,
+        db: AsyncSession,
+        token: str,
+        page: int,
+        size: int,
+        filters: TaskFilter,
+        projection: TaskFields
+    ) -> ORJSONResponse:
         logger.info(
             f"Getting tasks for user {token}, "
             f"page {page}, size {size}"
         )
         try:
             skip = (page - 1) * size
-            tasks = await task_db.get_user_tasks(token, self.db, skip, size)
-            total_tasks = await task_db.count_user_tasks(token, self.db)
+            tasks = await task_db.get_user_tasks(
+                token, db, skip, size, filters=filters,
+                fields=projection.columns
+            )
+            total_tasks = await task_db.count_user_tasks(
+                token, db, filters=filters
+            )
             total_pages = (
                 total_tasks + size - 1
             ) // size if size > 0 else 0
@@ -180,21 +587,9 @@ class TaskViews:
                 f"page {page}/{total_pages}"
             )
 
-            return JSONResponse(
+            return ORJSONResponse(
                 {
-                    "tasks": [
-                        {
-                            "task_id": str(task.task_id),
-                            "title": task.title,
-                            "description": task.description,
-                            "appointed_at": (
-                                task.appointed_at.isoformat()
-                                if task.appointed_at else None
-                            ),
-                            "created_at": task.created_at.isoformat()
-                        }
-                        for task in tasks
-                    ],
+                    "tasks": [_serialize_task(task, projection.fields) for task in tasks],
                     "pagination": {
                         "total_pages": total_pages,
                         "current_page": page,
@@ -207,7 +602,362 @@ class TaskViews:
             )
         except HTTPException as error:
             logger.error(f"Error during task retrieval: {error}")
-            return JSONResponse(
+            return ORJSONResponse(
                 {"message": "Internal server error"},
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+    async def _get_tasks_by_cursor(
+        self,
+        db: AsyncSession,
+        token: str,
+        size: int,
+        cursor: Optional[str],
+        include_total: bool,
+        filters: TaskFilter,
+        projection: TaskFields
+    ) -> ORJSONResponse:
+        logger.info(f"Getting tasks for user {token} by cursor, size {size}")
+        after = None
+        if cursor:
+            try:
+                sort, sort_value, task_id = decode_cursor(cursor, size=3)
+                if sort != filters.sort:
+                    raise ValueError(f"cursor was issued for sort {sort}")
+                after = (datetime.fromisoformat(sort_value), UUID(task_id))
+            except (ValueError, TypeError) as error:
+                logger.warning(f"Invalid cursor from user {token}: {error}")
+                return ORJSONResponse(
+                    {"message": "Invalid cursor"},
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+
+        # One extra row tells whether another page exists without counting
+        tasks = await task_db.get_user_tasks_after(
+            token, db, after=after, limit=size + 1, filters=filters,
+            fields=projection.columns
+        )
+        has_next = len(tasks) > size
+        tasks = tasks[:size]
+        next_cursor = None
+        if has_next:
+            last = tasks[-1]
+            next_cursor = encode_cursor(
+                filters.sort,
+                getattr(last, filters.sort_field).isoformat(),
+                str(last.task_id)
+            )
+
+        pagination = {
+            "page_size": size,
+            "next_cursor": next_cursor,
+            "has_next": has_next
+        }
+        if include_total:
+            pagination["total"] = await task_db.count_user_tasks(
+                token, db, filters=filters
+            )
+
+        logger.info(f"Retrieved {len(tasks)} tasks for user {token} by cursor")
+        return ORJSONResponse(
+            {
+                "tasks": [_serialize_task(task, projection.fields) for task in tasks],
+                "pagination": pagination
+            },
+            status_code=status.HTTP_200_OK
+        )
+
+    @tasks_router.get(
+        "/search",
+        summary="Full-text search in tasks of user",
+        response_model=TaskSearchResponse
+    )
+    async def search_tasks_endpoint(
+        self,
+        token=Depends(get_current_user_id),
+        read_db: AsyncSession = Depends(get_read_db),
+        q: str = Query(
+            ..., min_length=1, max_length=200,
+            description="Words to look for in title and description"
+        ),
+        size: int = Query(
+            10, ge=1, le=100, description="Number of tasks per page"
+        ),
+        cursor: Optional[str] = Query(
+            None, description="next_cursor from the previous page"
+        ),
+        fields: Optional[str] = Query(
+            None,
+            description="Comma separated task fields to return, e.g. title,appointed_at. "
+                        "task_id is always included"
+        ),
+    ) -> ORJSONResponse:
+        logger.info(f"Searching tasks of user {token}, size {size}")
+        try:
+            projection = TaskFields(fields=fields)
+        except ValidationError as error:
+            return _invalid_fields(error)
+        after = None
+        if cursor:
+            try:
+                rank, task_id = decode_cursor(cursor, size=2)
+                after = (float(rank), UUID(task_id))
+            except (ValueError, TypeError) as error:
+                logger.warning(f"Invalid search cursor from user {token}: {error}")
+                return ORJSONResponse(
+                    {"message": "Invalid cursor"},
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+
+        rows = await task_db.search_user_tasks(
+            token, q, read_db, after=after, limit=size + 1,
+            fields=projection.columns
+        )
+        has_next = len(rows) > size
+        rows = rows[:size]
+        next_cursor = None
+        if has_next:
+            last_task, last_rank = rows[-1]
+            next_cursor = encode_cursor(last_rank, str(last_task.task_id))
+
+        logger.info(f"Found {len(rows)} tasks for user {token}")
+        return ORJSONResponse(
+            {
+                "tasks": [
+                    {**_serialize_task(task, projection.fields), "rank": rank}
+                    for task, rank in rows
+                ],
+                "pagination": {
+                    "page_size": size,
+                    "next_cursor": next_cursor,
+                    "has_next": has_next
+                }
+            },
+            status_code=status.HTTP_200_OK
+        )
+
+    @tasks_router.get("/export", summary="Export all tasks of user")
+    async def export_tasks_endpoint(
+        self,
+        token=Depends(get_current_user_id),
+        export_format: Literal["ndjson", "csv"] = Query(
+            "ndjson", alias="format", description="ndjson or csv"
+        ),
+        fields: Optional[str] = Query(
+            None,
+            description="Comma separated task fields to return, e.g. title,appointed_at. "
+                        "task_id is always included"
+        ),
+    ) -> Response:
+        logger.info(f"Exporting tasks of user {token} as {export_format}")
+        try:
+            projection = TaskFields(fields=fields)
+        except ValidationError as error:
+            return _invalid_fields(error)
+        session_factory = await get_read_session_factory(token)
+        return StreamingResponse(
+            _export_tasks(token, export_format, projection, session_factory),
+            media_type=EXPORT_MEDIA_TYPES[export_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="tasks.{export_format}"'
+            }
+        )
+
+    @tasks_router.get("/events", summary="Live feed of task changes (Server-Sent Events)")
+    async def task_events_endpoint(
+        self,
+        request: Request,
+        token=Depends(get_current_user_id)
+    ) -> StreamingResponse:
+        logger.info(f"User {token} subscribed to task events")
+        return StreamingResponse(
+            _task_events(request, token),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    @tasks_router.get(
+        "/changes",
+        summary="Tasks written and deleted since a sync token",
+        response_model=TaskChangesResponse
+    )
+    async def task_changes_endpoint(
+        self,
+        token=Depends(get_current_user_id),
+        since: Optional[str] = Query(
+            None, description="next_token of the previous call, omit for a full sync"
+        ),
+        size: int = Query(
+            100, ge=1, le=500, description="Maximum number of changes per call"
+        ),
+    ) -> ORJSONResponse:
+        logger.info(f"Getting task changes for user {token}")
+        after, until, floor = CHANGES_ORIGIN, None, None
+        if since:
+            try:
+                after, until, floor = _decode_changes_token(since)
+            except (ValueError, TypeError) as error:
+                logger.warning(f"Invalid sync token from user {token}: {error}")
+                return ORJSONResponse(
+                    {"message": "Invalid sync token"},
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+        if floor and floor < datetime.now(timezone.utc) - task_db.TOMBSTONE_RETENTION:
+            logger.info(f"Sync token of user {token} outlived the tombstones")
+            return ORJSONResponse(
+                {"message": "Sync token expired, reload all tasks"},
+                status_code=status.HTTP_410_GONE
+            )
+
+        # Primary session: a replica lagging past the settle time would make
+        # the window skip writes it has not replayed yet
+        if until is None:
+            until = max(await task_db.get_changes_horizon(self.db, CHANGES_SETTLE), after[0])
+        changed, deleted = await task_db.get_task_changes(
+            token, self.db, after=after, until=until, limit=size
+        )
+        changes = sorted(
+            [(task.updated_at, task.task_id, task) for task in changed]
+            + [(tombstone.deleted_at, tombstone.task_id, None) for tombstone in deleted],
+            key=lambda change: change[:2]
+        )
+        has_more = len(changes) > size
+        changes = changes[:size]
+        if has_more:
+            next_token = _changes_token(changes[-1][:2], until, floor)
+        else:
+            next_token = _changes_token((until, CHANGES_MAX_TASK_ID), None, until)
+
+        logger.info(f"Retrieved {len(changes)} task changes for user {token}")
+        return ORJSONResponse(
+            {
+                "changed": [_serialize_task(task) for _, _, task in changes if task is not None],
+                "deleted": [str(task_id) for _, task_id, task in changes if task is None],
+                "next_token": next_token,
+                "has_more": has_more
+            },
+            status_code=status.HTTP_200_OK
+        )
+
+    @tasks_router.get(
+        "/stats",
+        summary="Task totals, overdue, due today and created per day",
+        response_model=TaskStatsResponse
+    )
+    async def task_stats_endpoint(
+        self,
+        token=Depends(get_current_user_id),
+        read_db: AsyncSession = Depends(get_read_db),
+        days: int = Query(
+            30, ge=1, le=366, description="Days of created_per_day, today (UTC) included"
+        ),
+    ) -> ORJSONResponse:
+        logger.info(f"Getting task stats for user {token}")
+        since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+        stats = await task_db.get_task_stats(token, read_db, since=since)
+        return ORJSONResponse(stats, status_code=status.HTTP_200_OK)
+
+    # Declared last: the path parameter would otherwise swallow /search, /export...
+    @tasks_router.get("/{task_id}", summary="Get a single task", response_model=TaskResponse)
+    async def get_task_endpoint(
+        self,
+        task_id: UUID,
+        token=Depends(get_current_user_id),
+        read_db: AsyncSession = Depends(get_read_db),
+        if_none_match: Optional[str] = Header(None)
+    ) -> Response:
+        logger.info(f"Getting task {task_id} for user {token}")
+        tasks_generation = await generation.get_generation(task_db.TASKS_NAMESPACE, token)
+        etag = make_etag(tasks_generation, task_id) if tasks_generation is not None else None
+        headers = {"ETag": etag} if etag else None
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        # Without a generation there is no ETag to check a cached body against
+        cached_task = await task_cache.get_cached_task(token, task_id, etag) if etag else None
+        if cached_task is not None:
+            return Response(
+                cached_task,
+                media_type="application/json",
+                status_code=status.HTTP_200_OK,
+                headers=headers
+            )
+
+        task = await task_db.get_task_by_id(
+            task_id=task_id,
+            user_id=token,
+            db=read_db
+        )
+        if task is None:
+            logger.warning(f"Task {task_id} not found for user {token}")
+            return ORJSONResponse(
+                {"message": "Task not found"},
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        response = ORJSONResponse(
+            _serialize_task(task), status_code=status.HTTP_200_OK, headers=headers
+        )
+        if etag:
+            await task_cache.cache_task(token, task_id, etag, response.body.decode("utf-8"))
+        return response
+
+
+async def _export_tasks(
+    user_id: str,
+    export_format: str,
+    projection: TaskFields,
+    session_factory: sessionmaker
+) -> AsyncIterator[str]:
+    # The request-scoped session is already closed once the body streams,
+    # so the export holds its own session for the lifetime of the cursor
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=projection.fields)
+    if export_format == "csv":
+        writer.writeheader()
+    exported = 0
+    try:
+        async with session_factory() as session:
+            stream = task_db.stream_user_tasks(
+                user_id, session,
+                fields=projection.columns
+            )
+            async for task in stream:
+                item = _serialize_task(task, projection.fields)
+                if export_format == "csv":
+                    writer.writerow({key: _csv_value(value) for key, value in item.items()})
+                else:
+                    buffer.write(orjson.dumps(item).decode("utf-8"))
+                    buffer.write("\n")
+                exported += 1
+                if exported % EXPORT_FLUSH_ROWS == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+        yield buffer.getvalue()
+        logger.info(f"Exported {exported} tasks of user {user_id}")
+    except Exception as error:
+        # Headers are already sent, aborting the stream is the only signal left
+        logger.error(f"Task export of user {user_id} failed after {exported} rows: {error}")
+        raise
+
+
+async def _task_events(request: Request, user_id: str) -> AsyncIterator[str]:
+    """
+    SSE stream: `change` events carry {"created"|"updated"|"deleted": [task ids]},
+    `resync` means events were dropped and the list must be fetched again.
+    """
+    async with task_events.TaskEventSubscription(user_id, EVENTS_BUFFER_SIZE) as subscription:
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            event = await subscription.get(timeout=EVENTS_HEARTBEAT_SECONDS)
+            if event is None:
+                yield ": keep-alive\n\n"
+            elif event is task_events.RESYNC:
+                yield "event: resync\ndata: {}\n\n"
+            elif event is task_events.CLOSED:
+                # The client reconnects after `retry` and gets a fresh subscription
+                logger.warning(f"Task event stream of user {user_id} lost Redis")
+                break
+            else:
+                yield f"event: change\ndata: {event}\n\n"
+    logger.info(f"User {user_id} unsubscribed from task events")
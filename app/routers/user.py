@@ -1,31 +1,53 @@
-from fastapi.responses import JSONResponse
-from fastapi import status, Depends, APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse, Response
+from fastapi import status, Depends, APIRouter, HTTPException, Header
 from fastapi_utils.cbv import cbv
 from app.schemas.user import UserLogin, UserSignup
 from app.database import user as user_db
-from app.database.database import get_db, AsyncSession
+from app.database.database import get_db, get_authed_db, get_read_db, AsyncSession
 from app.utils.jwt_manager import create_access_token
 from app.external import avatar as avatar_ext
 from app.utils.oauth2Schema import get_current_user_id
 from loguru import logger
 from fastapi import File, UploadFile
 from uuid import UUID
-from app.core.celery_worker import start_verification
+from app.core.celery_worker import start_verification, purge_deleted_user
 from app.schemas.user import UserVerify
 from app.redis_client import redis_session
+from app.cache import generation
+from app.utils.etag import make_etag, etag_matches, not_modified
+from app.utils.password_manager import PasswordHasherBusy
+from typing import Optional
 
-user_router = APIRouter(prefix="/user", tags=["User"])
+user_router = APIRouter(
+    prefix="/user",
+    tags=["User"],
+    default_response_class=ORJSONResponse
+)
+
+
+def _hasher_busy(email: str) -> HTTPException:
+    logger.warning(f"Password hashing saturated, rejecting request of {email}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, retry shortly",
+        headers={"Retry-After": "1"}
+    )
 
 
 @cbv(user_router)
 class UserViews:
-    db: AsyncSession = Depends(get_db)
+    # No class-level session: each endpoint asks for the one it needs,
+    # after authentication where a token is required
 
     @user_router.post("/login", summary="Login")
-    async def login_endpoint(self, user_data: UserLogin) -> JSONResponse:
+    async def login_endpoint(
+        self,
+        user_data: UserLogin,
+        db: AsyncSession = Depends(get_db)
+    ) -> ORJSONResponse:
         logger.info(f"Login attempt for user: {user_data.email}")
         try:
-            user = await user_db.authenticate_user(db=self.db, user=user_data)
+            user = await user_db.authenticate_user(db=db, user=user_data)
             if not user:
                 logger.warning(f"Login failed for user: {user_data.email}")
                 raise HTTPException(
@@ -42,7 +64,7 @@ class UserViews:
 
             token = create_access_token(user_id=user.user_id)
             logger.info(f"User {user_data.email} logged in successfully")
-            return JSONResponse(
+            return ORJSONResponse(
                 {
                     "access_token": token,
                     "token_type": "bearer",
@@ -51,6 +73,8 @@ class UserViews:
             )
         except HTTPException:
             raise
+        except PasswordHasherBusy:
+            raise _hasher_busy(user_data.email)
         except Exception as error:
             logger.error(f"Unexpected error during login: {error}")
             raise HTTPException(
@@ -59,14 +83,18 @@ class UserViews:
             )
 
     @user_router.post("/signup", summary="Create user")
-    async def signup_endpoint(self, user_data: UserSignup) -> JSONResponse:
+    async def signup_endpoint(
+        self,
+        user_data: UserSignup,
+        db: AsyncSession = Depends(get_db)
+    ) -> ORJSONResponse:
         logger.info(f"Signup attempt for user: {user_data.email}")
         try:
-            new_user = await user_db.create_user(db=self.db, user=user_data)
+            new_user = await user_db.create_user(db=db, user=user_data)
             if new_user:
                 await start_verification(email=user_data.email)
                 logger.info(f"User {user_data.email} created successfully. Verification pending.")
-                return JSONResponse(
+                return ORJSONResponse(
                     {
                         "message": "User created. Please verify your email.",
                         "user_id": str(new_user.user_id)
@@ -74,12 +102,14 @@ class UserViews:
                     status_code=status.HTTP_201_CREATED
                 )
             logger.warning(f"Signup failed for user: {user_data.username}")
-            return JSONResponse(
+            return ORJSONResponse(
                 {
                     "message": "Signup failed, try to change the username"
                 },
                 status_code=status.HTTP_400_BAD_REQUEST
             )
+        except PasswordHasherBusy:
+            raise _hasher_busy(user_data.email)
         except Exception as error:
             logger.error(f"Unexpected error during signup: {error}")
             raise HTTPException(
@@ -88,7 +118,11 @@ class UserViews:
             )
 
     @user_router.post("/verify", summary="Verify user email")
-    async def verify_user_endpoint(self, verify_data: UserVerify) -> JSONResponse:
+    async def verify_user_endpoint(
+        self,
+        verify_data: UserVerify,
+        db: AsyncSession = Depends(get_db)
+    ) -> ORJSONResponse:
         logger.info(f"Verification attempt for: {verify_data.email}")
         try:
             async with redis_session() as session:
@@ -98,10 +132,10 @@ class UserViews:
             if not redis_code or redis_code != verify_data.code:
                 raise HTTPException(status_code=400, detail="Invalid code or expired")
 
-            verified_user = await user_db.verify_user(email=verify_data.email, db=self.db)
+            verified_user = await user_db.verify_user(email=verify_data.email, db=db)
             if verified_user:
                 token = create_access_token(user_id=verified_user.user_id)
-                return JSONResponse(
+                return ORJSONResponse(
                     content={
                         "message": "User verified successfully",
                         "access_token": token,
@@ -118,18 +152,22 @@ class UserViews:
             raise HTTPException(status_code=500, detail="Internal server error")
 
     @user_router.delete("/avatar", summary="Delete avatar")
-    async def delete_avatar_endpoint(self, token: str = Depends(get_current_user_id)) -> JSONResponse:
+    async def delete_avatar_endpoint(
+        self,
+        token: str = Depends(get_current_user_id),
+        db: AsyncSession = Depends(get_authed_db)
+    ) -> ORJSONResponse:
         try:
-            user = await user_db.delete_avatar_database(user_id=token, db=self.db)
+            user = await user_db.delete_avatar_database(user_id=token, db=db)
             if user:
                 await avatar_ext.delete_avatar(user_id=token)
-                return JSONResponse(
+                return ORJSONResponse(
                     {
                         "message": "Avatar deleted successfully"
                     },
                     status_code=status.HTTP_200_OK
                 )
-            return JSONResponse(
+            return ORJSONResponse(
                 {
                     "message": "Avatar deleted successfully"
                 },
@@ -146,8 +184,9 @@ class UserViews:
     async def upload_avatar_endpoint(
         self,
         user_id: UUID = Depends(get_current_user_id),
+        db: AsyncSession = Depends(get_authed_db),
         file: UploadFile = File(...)
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         try:
             if not file.content_type.startswith("image/"):
                 raise HTTPException(status_code=400, detail="Only images allowed")
@@ -155,13 +194,15 @@ class UserViews:
             content = await file.read()
             s3_path = await avatar_ext.post_avatar(user_id=user_id, file=content)
 
-            user = await user_db.add_avatar(user_id=user_id, avatar_url=s3_path, db=self.db)
+            user = await user_db.add_avatar(user_id=user_id, avatar_url=s3_path, db=db)
 
             if user:
-                return JSONResponse(
+                return ORJSONResponse(
                     content={"message": "Avatar uploaded", "path": s3_path},
                     status_code=status.HTTP_201_CREATED
                 )
+            # Deleted meanwhile: the purge may already be past the avatar
+            await avatar_ext.delete_avatar(user_id=user_id)
             raise HTTPException(status_code=404, detail="User not found")
 
         except HTTPException:
@@ -171,16 +212,54 @@ class UserViews:
             raise HTTPException(status_code=500, detail="Internal server error")
 
     @user_router.get("/avatar", summary="Get avatar")
-    async def get_avatar_endpoint(self, user_id: UUID = Depends(get_current_user_id)) -> JSONResponse:
-        avatar_path = await user_db.get_avatar(user_id=user_id, db=self.db)
+    async def get_avatar_endpoint(
+        self,
+        user_id: UUID = Depends(get_current_user_id),
+        read_db: AsyncSession = Depends(get_read_db),
+        if_none_match: Optional[str] = Header(None)
+    ) -> Response:
+        # The version lives in Redis, an unchanged avatar never reaches Postgres
+        avatar_generation = await generation.get_generation(user_db.AVATAR_NAMESPACE, user_id)
+        etag = make_etag(avatar_generation) if avatar_generation is not None else None
+        headers = {"ETag": etag} if etag else None
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        avatar_path = await user_db.get_avatar(user_id=user_id, db=read_db)
 
         if avatar_path:
             full_url = f"http://localhost:9000/{avatar_path}"
-            return JSONResponse({"avatar_url": full_url})
+            return ORJSONResponse({"avatar_url": full_url}, headers=headers)
 
-        return JSONResponse(
+        return ORJSONResponse(
             {
                 "message": "Using default avatar",
                 "avatar_url": "http://localhost:9000/avatars/default_avatar.jpeg"
-            }
+            },
+            headers=headers
+        )
+
+    @user_router.delete("/", summary="Delete account", status_code=status.HTTP_202_ACCEPTED)
+    async def delete_account_endpoint(
+        self,
+        user_id: UUID = Depends(get_current_user_id),
+        db: AsyncSession = Depends(get_authed_db)
+    ) -> ORJSONResponse:
+        logger.info(f"Account deletion requested by user {user_id}")
+        try:
+            user = await user_db.mark_user_deleted(user_id=user_id, db=db)
+        except Exception as error:
+            logger.error(f"Account deletion failed for user {user_id}: {error}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error"
+            )
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        # Tasks and avatar go in the background, the account is closed already
+        purge_deleted_user.delay(str(user.user_id))
+        return ORJSONResponse(
+            {"message": "Account deleted, its data is being removed"},
+            status_code=status.HTTP_202_ACCEPTED
         )
@@ -4,5 +4,10 @@ from .user import (
 )
 from .task import (
     TaskCreate,
-    TaskUpdate
+    TaskUpdate,
+    TaskBatchCreate,
+    TaskBatchUpdate,
+    TaskBatchDelete,
+    TaskFilter,
+    TaskFields
 )
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
-from typing import Optional, Any, List
+from typing import Optional, Any, List, Union
+from datetime import date, datetime
+from uuid import UUID
 
 
 class APIResponse(BaseModel):
@@ -12,17 +14,76 @@ class APIResponse(BaseModel):
 
 class TaskResponse(BaseModel):
     """Task response schema"""
-    task_id: str
+    task_id: UUID
     title: str
     description: Optional[str] = None
-    appointed_at: Optional[str] = None
-    created_at: str
+    appointed_at: Optional[datetime] = None
+    created_at: datetime
+
+
+class TaskFieldsResponse(BaseModel):
+    """Task restricted to the fields requested through `fields`"""
+    task_id: UUID
+    title: Optional[str] = None
+    description: Optional[str] = None
+    appointed_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+
+class TaskSearchResult(TaskFieldsResponse):
+    """Task matched by full-text search"""
+    rank: float
+
+
+class PagePagination(BaseModel):
+    """Numbered page metadata"""
+    total_pages: int
+    current_page: int
+    page_size: int
+    has_next: bool
+    has_prev: bool
+
+
+class CursorPagination(BaseModel):
+    """Keyset page metadata"""
+    page_size: int
+    next_cursor: Optional[str] = None
+    has_next: bool
+    total: Optional[int] = None
 
 
 class TaskListResponse(BaseModel):
     """Task list response with pagination"""
-    tasks: List[TaskResponse]
-    pagination: dict
+    tasks: List[TaskFieldsResponse]
+    pagination: Union[PagePagination, CursorPagination]
+
+
+class TaskSearchResponse(BaseModel):
+    """Full-text search results"""
+    tasks: List[TaskSearchResult]
+    pagination: CursorPagination
+
+
+class TaskChangesResponse(BaseModel):
+    """Tasks written and deleted since a sync token"""
+    changed: List[TaskResponse]
+    deleted: List[UUID]
+    next_token: str
+    has_more: bool
+
+
+class DailyCount(BaseModel):
+    """Tasks created on one UTC day"""
+    day: date
+    count: int
+
+
+class TaskStatsResponse(BaseModel):
+    """Dashboard figures of the tasks of a user"""
+    total: int
+    overdue: int
+    due_today: int
+    created_per_day: List[DailyCount]
 
 
 class TaskCreateResponse(BaseModel):
@@ -31,6 +92,44 @@ class TaskCreateResponse(BaseModel):
     task_id: str
 
 
+class TaskBatchItemResult(BaseModel):
+    """Outcome of a single item of a batch request"""
+    index: int
+    task_id: Optional[str] = None
+    errors: Optional[List[dict]] = None
+
+
+class TaskBatchCreateResponse(BaseModel):
+    """Batch task creation response"""
+    message: str
+    created: int
+    results: List[TaskBatchItemResult]
+
+
+class TaskBatchChangeResponse(BaseModel):
+    """Batch task update/deletion response"""
+    message: str
+    task_ids: List[str]
+    not_found: List[str]
+
+
+class TaskImportChunkReport(BaseModel):
+    """Progress of one imported chunk"""
+    chunk: int
+    rows: int
+    imported: int
+    failed: int
+    errors: List[dict] = []
+
+
+class TaskImportResponse(BaseModel):
+    """Task import summary"""
+    message: str
+    imported: int
+    failed: int
+    chunks: List[TaskImportChunkReport]
+
+
 class TaskUpdateResponse(BaseModel):
     """Task update response"""
     message: str
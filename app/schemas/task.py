@@ -1,6 +1,11 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Optional, List, Dict, Any, Literal, Tuple    # noqa: TYP001
 from datetime import datetime, timezone
+from uuid import UUID
+
+MAX_TASK_BATCH_SIZE = 500
+# Columns a client may ask for through `fields`, in response order
+TASK_FIELDS = ("task_id", "title", "description", "appointed_at", "created_at")
 
 
 class TaskCreate(BaseModel):
@@ -81,3 +86,116 @@ class TaskUpdate(BaseModel):
             if v < datetime.now(timezone.utc):
                 raise ValueError('Appointment time cannot be in the past')
         return v
+
+
+class TaskBatchCreate(BaseModel):
+    # Items stay raw here and are validated one by one against TaskCreate,
+    # so a single bad item is reported instead of rejecting the whole batch
+    tasks: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_TASK_BATCH_SIZE,
+        description=f"Tasks to create (1-{MAX_TASK_BATCH_SIZE} items)"
+    )
+
+
+class TaskBatchDelete(BaseModel):
+    task_ids: List[UUID] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_TASK_BATCH_SIZE,
+        description=f"Ids of the tasks (1-{MAX_TASK_BATCH_SIZE} items)"
+    )
+
+    @field_validator('task_ids')
+    @classmethod
+    def validate_task_ids(cls, v: List[UUID]) -> List[UUID]:
+        return list(dict.fromkeys(v))
+
+
+class TaskBatchUpdate(TaskBatchDelete):
+    changes: TaskUpdate = Field(
+        ...,
+        description="Fields to set on every listed task"
+    )
+
+
+class TaskFilter(BaseModel):
+    due_after: Optional[datetime] = Field(
+        None,
+        description="Only tasks due at or after this time"
+    )
+    due_before: Optional[datetime] = Field(
+        None,
+        description="Only tasks due before this time"
+    )
+    overdue: bool = Field(
+        False,
+        description="Only tasks whose due time has passed"
+    )
+    sort: Literal["created_at", "-created_at", "appointed_at", "-appointed_at"] = Field(
+        "created_at",
+        description="Sort column, '-' prefix for descending order"
+    )
+
+    @field_validator('due_after', 'due_before')
+    @classmethod
+    def validate_due_range(
+        cls, v: Optional[datetime]
+    ) -> Optional[datetime]:
+        if v and v.tzinfo is None:
+            v = v.replace(tzinfo=timezone.utc)
+        return v
+
+    @model_validator(mode='after')
+    def validate_range_order(self) -> 'TaskFilter':
+        if self.due_after and self.due_before and self.due_after >= self.due_before:
+            raise ValueError('due_after must be earlier than due_before')
+        return self
+
+    @property
+    def sort_field(self) -> str:
+        return self.sort.lstrip("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.sort.startswith("-")
+
+    @property
+    def due_only(self) -> bool:
+        """Due-date filters and sorting only consider tasks that have a due time."""
+        return bool(
+            self.due_after or self.due_before or self.overdue
+            or self.sort_field == "appointed_at"
+        )
+
+
+class TaskFields(BaseModel):
+    fields: Tuple[str, ...] = Field(
+        TASK_FIELDS,
+        description="Task columns to return, task_id is always included"
+    )
+
+    @field_validator('fields', mode='before')
+    @classmethod
+    def parse_fields(cls, v: Any) -> Tuple[str, ...]:
+        if v is None:
+            return TASK_FIELDS
+        if isinstance(v, str):
+            v = v.split(",")
+        requested = {field.strip() for field in v if field.strip()}
+        if not requested:
+            raise ValueError('at least one field is required')
+        unknown = requested.difference(TASK_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown fields: {', '.join(sorted(unknown))}")
+        # Canonical order keeps cache keys and ETags independent of how the list was written
+        return tuple(
+            field for field in TASK_FIELDS
+            if field == "task_id" or field in requested
+        )
+
+    @property
+    def columns(self) -> Optional[Tuple[str, ...]]:
+        """Columns to project in SQL, None when every field is requested."""
+        return None if self.fields == TASK_FIELDS else self.fields
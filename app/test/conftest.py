@@ -22,6 +22,7 @@ def mock_redis():
     redis_mock.set.return_value = True
     redis_mock.expire.return_value = True
     redis_mock.incr.return_value = 1
+    redis_mock.exists.return_value = 0
     return redis_mock
 
 
@@ -36,12 +37,13 @@ def _make_app() -> FastAPI:
 def client(db_session, mock_redis):
     app = _make_app()
 
-    from app.database.database import get_db
+    from app.database.database import get_db, get_read_db
 
     async def override_get_db():
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     # Mock Redis to prevent connection issues
     with patch('app.redis_client.redis_client', mock_redis):
@@ -55,7 +57,7 @@ def client(db_session, mock_redis):
 def authed_client(db_session, mock_redis):
     app = _make_app()
 
-    from app.database.database import get_db
+    from app.database.database import get_db, get_read_db
     from app.utils.oauth2Schema import get_current_user_id
 
     async def override_get_db():
@@ -65,6 +67,7 @@ def authed_client(db_session, mock_redis):
         return TEST_USER_ID
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     app.dependency_overrides[get_current_user_id] = override_user_id
 
     # Mock Redis to prevent connection issues
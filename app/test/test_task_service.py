@@ -108,7 +108,7 @@ class TestTaskViews:
     def test_patch_task_not_found(self, client, auth_token):
         task_id = str(uuid4())
         with patch(
-            "app.database.task.get_task_by_id",
+            "app.database.task.update_task_by_id",
             new_callable=AsyncMock,
             return_value=None
         ):
@@ -241,3 +241,903 @@ class TestTaskViews:
         assert data["pagination"]["page_size"] == 10
         assert data["pagination"]["has_next"] is not None
         assert data["pagination"]["has_prev"] is not None
+
+    def test_get_tasks_by_cursor(self, client, auth_token):
+        tasks = []
+        for index in range(3):
+            mock_task = MagicMock()
+            mock_task.task_id = uuid4()
+            mock_task.title = f"Task {index}"
+            mock_task.description = None
+            mock_task.appointed_at = None
+            mock_task.created_at = datetime.now()
+            tasks.append(mock_task)
+
+        with patch("app.database.task.get_user_tasks_after", new_callable=AsyncMock, return_value=tasks) as mock_page, \
+                patch("app.database.task.count_user_tasks", new_callable=AsyncMock) as mock_count:
+            response = client.get(
+                "/task/?pagination=cursor&size=2",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data["tasks"]) == 2
+            assert data["pagination"]["has_next"] is True
+            assert "total" not in data["pagination"]
+            assert mock_page.await_args.kwargs["limit"] == 3
+            mock_count.assert_not_awaited()
+
+            next_cursor = data["pagination"]["next_cursor"]
+            response = client.get(
+                f"/task/?cursor={next_cursor}&size=2",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        assert mock_page.await_args.kwargs["after"] == (tasks[1].created_at, tasks[1].task_id)
+
+    def test_get_tasks_invalid_cursor(self, client, auth_token):
+        response = client.get(
+            "/task/?cursor=not-a-cursor",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+
+        assert response.status_code == 400
+        assert response.json()["message"] == "Invalid cursor"
+
+    def test_post_task_batch_partial(self, client, auth_token):
+        created_id = uuid4()
+        payload = {"tasks": [{"title": "Valid task"}, {"title": "   "}]}
+
+        with patch("app.database.task.create_tasks", new_callable=AsyncMock, return_value=[created_id]) as mock_create:
+            response = client.post(
+                "/task/batch",
+                json=payload,
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["created"] == 1
+        assert data["results"][0]["task_id"] == str(created_id)
+        assert data["results"][1]["task_id"] is None
+        assert data["results"][1]["errors"][0]["field"] == "title"
+        assert len(mock_create.await_args.kwargs["tasks"]) == 1
+
+    def test_post_task_batch_too_large(self, client, auth_token):
+        from app.schemas.task import MAX_TASK_BATCH_SIZE
+
+        payload = {"tasks": [{"title": "Task"}] * (MAX_TASK_BATCH_SIZE + 1)}
+        response = client.post(
+            "/task/batch",
+            json=payload,
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+
+        assert response.status_code == 422
+
+    def test_patch_task_batch(self, client, auth_token):
+        updated_id, missing_id = uuid4(), uuid4()
+        payload = {
+            "task_ids": [str(updated_id), str(missing_id)],
+            "changes": {"title": "Renamed"}
+        }
+
+        with patch("app.database.task.update_tasks", new_callable=AsyncMock, return_value=[updated_id]) as mock_update:
+            response = client.patch(
+                "/task/batch",
+                json=payload,
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["task_ids"] == [str(updated_id)]
+        assert data["not_found"] == [str(missing_id)]
+        assert mock_update.await_args.kwargs["task_update_data"].title == "Renamed"
+
+    def test_delete_task_batch(self, client, auth_token):
+        deleted_id = uuid4()
+
+        with patch("app.database.task.remove_tasks", new_callable=AsyncMock, return_value=[deleted_id]):
+            response = client.request(
+                "DELETE",
+                "/task/batch",
+                json={"task_ids": [str(deleted_id), str(deleted_id)]},
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        assert response.json()["task_ids"] == [str(deleted_id)]
+        assert response.json()["not_found"] == []
+
+    def test_export_tasks_ndjson_and_csv(self, client, auth_token):
+        import csv
+        import io
+        import json
+
+        mock_task = MagicMock()
+        mock_task.task_id = uuid4()
+        mock_task.title = "Exported, task"
+        mock_task.description = None
+        mock_task.appointed_at = None
+        mock_task.created_at = datetime.now()
+
+        async def fake_stream(user_id, db, chunk_size=1000, fields=None):
+            for _ in range(3):
+                yield mock_task
+
+        with patch("app.database.task.stream_user_tasks", new=fake_stream):
+            ndjson_response = client.get(
+                "/task/export",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+            csv_response = client.get(
+                "/task/export?format=csv",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert ndjson_response.status_code == 200
+        assert ndjson_response.headers["content-type"].startswith("application/x-ndjson")
+        lines = ndjson_response.text.splitlines()
+        assert len(lines) == 3
+        assert json.loads(lines[0])["task_id"] == str(mock_task.task_id)
+
+        assert csv_response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(csv_response.text)))
+        assert len(rows) == 3
+        assert rows[0]["title"] == "Exported, task"
+
+    def test_import_tasks_copies_valid_rows_in_chunks(self, client, auth_token):
+        body = "\n".join(
+            ['{"title": "Task %d"}' % index for index in range(150)]
+            + ['{"title": ""}', "not json"]
+        )
+
+        with patch("app.database.task.copy_tasks", new_callable=AsyncMock) as mock_copy:
+            mock_copy.side_effect = lambda records, db: len(records)
+            response = client.post(
+                "/task/import?chunk_size=100",
+                content=body.encode(),
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["imported"] == 150
+        assert data["failed"] == 2
+        assert [chunk["rows"] for chunk in data["chunks"]] == [100, 52]
+        assert [error["line"] for error in data["chunks"][1]["errors"]] == [151, 152]
+        assert mock_copy.await_count == 2
+
+    def test_import_tasks_reports_chunks_before_undecodable_line(self, client, auth_token):
+        body = "\n".join('{"title": "Task %d"}' % index for index in range(150)).encode()
+        body += b'\n{"title": "\xff"}\n{"title": "Never read"}'
+
+        with patch("app.database.task.copy_tasks", new_callable=AsyncMock) as mock_copy:
+            mock_copy.side_effect = lambda records, db: len(records)
+            response = client.post(
+                "/task/import?chunk_size=100",
+                content=body,
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["imported"] == 150
+        assert data["failed"] == 1
+        assert [chunk["rows"] for chunk in data["chunks"]] == [100, 51]
+        assert data["chunks"][1]["errors"] == [
+            {"line": 151, "message": "Line 151 is not UTF-8 encoded, import stopped"}
+        ]
+
+    def test_search_tasks(self, client, auth_token):
+        rows = []
+        for rank in (0.9, 0.5):
+            mock_task = MagicMock()
+            mock_task.task_id = uuid4()
+            mock_task.title = "Buy milk"
+            mock_task.description = None
+            mock_task.appointed_at = None
+            mock_task.created_at = datetime.now()
+            rows.append((mock_task, rank))
+
+        with patch("app.database.task.search_user_tasks", new_callable=AsyncMock, return_value=rows) as mock_search:
+            response = client.get(
+                "/task/search?q=milk&size=1",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+            assert response.status_code == 200
+            data = response.json()
+            assert [task["rank"] for task in data["tasks"]] == [0.9]
+            assert data["pagination"]["has_next"] is True
+
+            client.get(
+                f"/task/search?q=milk&size=1&cursor={data['pagination']['next_cursor']}",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert mock_search.await_args.kwargs["after"] == (0.9, rows[0][0].task_id)
+
+    def test_get_tasks_filtered_by_due_date(self, client, auth_token):
+        with patch("app.database.task.get_user_tasks", new_callable=AsyncMock, return_value=[]) as mock_get, \
+                patch("app.database.task.count_user_tasks", new_callable=AsyncMock, return_value=0) as mock_count:
+            response = client.get(
+                "/task/?due_after=2030-01-01T00:00:00&due_before=2030-01-08T00:00:00&sort=-appointed_at",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        filters = mock_get.await_args.kwargs["filters"]
+        assert filters.due_only and filters.descending
+        assert filters.due_after.tzinfo is not None
+        assert mock_count.await_args.kwargs["filters"] == filters
+
+    def test_get_tasks_invalid_due_range(self, client, auth_token):
+        response = client.get(
+            "/task/?due_after=2030-01-08T00:00:00&due_before=2030-01-01T00:00:00",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+
+        assert response.status_code == 422
+
+    def test_get_tasks_cursor_sort_mismatch(self, client, auth_token):
+        from app.utils.cursor import encode_cursor
+
+        cursor = encode_cursor("created_at", datetime.now().isoformat(), str(uuid4()))
+        response = client.get(
+            f"/task/?cursor={cursor}&sort=appointed_at",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+
+        assert response.status_code == 400
+
+    def test_get_task_cache_miss_then_hit(self, client, auth_token):
+        mock_task = MagicMock()
+        mock_task.task_id = uuid4()
+        mock_task.title = "Detail"
+        mock_task.description = "Shown in detail view"
+        mock_task.appointed_at = None
+        mock_task.created_at = datetime.now()
+
+        with patch("app.cache.task_cache.get_cached_task", new_callable=AsyncMock, return_value=None), \
+                patch("app.cache.task_cache.cache_task", new_callable=AsyncMock) as mock_fill, \
+                patch("app.database.task.get_task_by_id", new_callable=AsyncMock, return_value=mock_task):
+            response = client.get(
+                f"/task/{mock_task.task_id}",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        assert response.json()["title"] == "Detail"
+        etag, cached_body = mock_fill.await_args.args[2:]
+        assert etag == response.headers["etag"]
+        assert cached_body == response.text
+
+        with patch("app.cache.task_cache.get_cached_task", new_callable=AsyncMock, return_value=cached_body), \
+                patch("app.database.task.get_task_by_id", new_callable=AsyncMock) as mock_get:
+            response = client.get(
+                f"/task/{mock_task.task_id}",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        assert response.text == cached_body
+        mock_get.assert_not_awaited()
+
+    def test_get_task_not_found(self, client, auth_token):
+        with patch("app.database.task.get_task_by_id", new_callable=AsyncMock, return_value=None):
+            response = client.get(
+                f"/task/{uuid4()}",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 404
+
+    def test_get_tasks_served_from_page_cache(self, client, auth_token):
+        cached_body = '{"tasks":[],"pagination":{"total_pages":0}}'
+        with patch("app.cache.generation.get_generation", new_callable=AsyncMock, return_value="7"), \
+                patch("app.cache.page_cache.get_page", new_callable=AsyncMock, return_value=cached_body) as mock_page, \
+                patch("app.database.task.get_user_tasks", new_callable=AsyncMock) as mock_get:
+            response = client.get(
+                "/task/?page=2",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        assert response.text == cached_body
+        assert mock_page.await_args.args[1] == "7"
+        assert mock_page.await_args.args[2]["page"] == 2
+        mock_get.assert_not_awaited()
+
+    def test_get_tasks_page_cached_under_generation(self, client, auth_token):
+        with patch("app.cache.generation.get_generation", new_callable=AsyncMock, return_value="7"), \
+                patch("app.cache.page_cache.get_page", new_callable=AsyncMock, return_value=None), \
+                patch("app.cache.page_cache.store_page", new_callable=AsyncMock) as mock_store, \
+                patch("app.database.task.get_user_tasks", new_callable=AsyncMock, return_value=[]), \
+                patch("app.database.task.count_user_tasks", new_callable=AsyncMock, return_value=0):
+            response = client.get(
+                "/task/",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        generation, params, body = mock_store.await_args.args[1:]
+        assert generation == "7"
+        assert params["page"] == 1
+        assert body == response.text
+
+    def test_get_tasks_not_modified(self, client, auth_token):
+        with patch("app.cache.generation.get_generation", new_callable=AsyncMock, return_value="7"), \
+                patch("app.cache.page_cache.get_page", new_callable=AsyncMock, return_value=None), \
+                patch("app.database.task.get_user_tasks", new_callable=AsyncMock, return_value=[]) as mock_get, \
+                patch("app.database.task.count_user_tasks", new_callable=AsyncMock, return_value=0):
+            response = client.get(
+                "/task/",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+            etag = response.headers["ETag"]
+
+            response = client.get(
+                "/task/",
+                headers={"Authorization": f"Bearer {auth_token}", "If-None-Match": etag}
+            )
+            assert response.status_code == 304
+            assert mock_get.await_count == 1
+
+            response = client.get(
+                "/task/?page=2",
+                headers={"Authorization": f"Bearer {auth_token}", "If-None-Match": etag}
+            )
+            assert response.status_code == 200
+
+    def test_get_tasks_with_sparse_fields(self, client, auth_token):
+        mock_task = MagicMock()
+        mock_task.task_id = uuid4()
+        mock_task.title = "Only the title"
+
+        with patch("app.database.task.get_user_tasks", new_callable=AsyncMock, return_value=[mock_task]) as mock_get, \
+                patch("app.database.task.count_user_tasks", new_callable=AsyncMock, return_value=1):
+            response = client.get(
+                "/task/?fields=title, title",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        assert mock_get.await_args.kwargs["fields"] == ("task_id", "title")
+        assert response.json()["tasks"] == [
+            {"task_id": str(mock_task.task_id), "title": "Only the title"}
+        ]
+
+    def test_get_tasks_unknown_field(self, client, auth_token):
+        response = client.get(
+            "/task/?fields=title,password",
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+
+        assert response.status_code == 422
+        assert response.json()["message"] == "Invalid fields"
+
+    def test_export_tasks_with_sparse_fields(self, client, auth_token):
+        mock_task = MagicMock()
+        mock_task.task_id = uuid4()
+        mock_task.appointed_at = None
+        requested = []
+
+        async def fake_stream(user_id, db, chunk_size=1000, fields=None):
+            requested.append(fields)
+            yield mock_task
+
+        with patch("app.database.task.stream_user_tasks", new=fake_stream):
+            response = client.get(
+                "/task/export?format=csv&fields=appointed_at",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        assert requested == [("task_id", "appointed_at")]
+        assert response.text.splitlines()[0] == "task_id,appointed_at"
+
+    def test_invalid_token_never_opens_session(self, client):
+        from app.database.database import get_db
+
+        opened = []
+
+        async def tracking_get_db():
+            opened.append(True)
+            yield AsyncMock()
+
+        client.app.dependency_overrides[get_db] = tracking_get_db
+        for method, path in (("get", "/task/"), ("post", "/task/"), ("delete", f"/task/{uuid4()}")):
+            response = client.request(
+                method, path,
+                json={"title": "Task"},
+                headers={"Authorization": "Bearer expired"}
+            )
+            assert response.status_code == 401
+
+        assert opened == []
+
+    def test_task_events_stream(self, client, auth_token):
+        from app.cache import task_events
+
+        class FakeSubscription:
+            events = ['{"created":["a"]}', task_events.RESYNC, None, task_events.CLOSED]
+
+            def __init__(self, user_id, max_buffered):
+                pass
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc_info):
+                return None
+
+            async def get(self, timeout):
+                return self.events.pop(0)
+
+        with patch("app.cache.task_events.TaskEventSubscription", FakeSubscription):
+            response = client.get(
+                "/task/events",
+                headers={"Authorization": f"Bearer {auth_token}"}
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text == (
+            "retry: 3000\n\n"
+            'event: change\ndata: {"created":["a"]}\n\n'
+            "event: resync\ndata: {}\n\n"
+            ": keep-alive\n\n"
+        )
+
+    def test_task_changes_pages_and_expires(self, client, auth_token):
+        from datetime import timezone, timedelta
+        from app.routers.task import _changes_token
+
+        base = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+        changed, deleted = MagicMock(), MagicMock()
+        changed.task_id, changed.updated_at = uuid4(), base + timedelta(seconds=2)
+        changed.title, changed.description = "Task", None
+        changed.appointed_at, changed.created_at = None, base
+        deleted.task_id, deleted.deleted_at = uuid4(), base + timedelta(seconds=1)
+        horizon = base + timedelta(minutes=1)
+        headers = {"Authorization": f"Bearer {auth_token}"}
+
+        with patch("app.database.task.get_changes_horizon", new_callable=AsyncMock, return_value=horizon), \
+                patch("app.database.task.get_task_changes", new_callable=AsyncMock,
+                      return_value=([changed], [deleted])) as mock_changes:
+            response = client.get("/task/changes?size=1", headers=headers)
+            assert response.status_code == 200
+            page = response.json()
+            assert page["changed"] == [] and page["deleted"] == [str(deleted.task_id)]
+            assert page["has_more"] is True
+
+            response = client.get(f"/task/changes?size=1&since={page['next_token']}", headers=headers)
+            assert response.status_code == 200
+            assert mock_changes.await_args.kwargs["after"] == (deleted.deleted_at, deleted.task_id)
+            assert mock_changes.await_args.kwargs["until"] == horizon
+
+        expired = _changes_token((base, uuid4()), None, datetime.now(timezone.utc) - timedelta(days=31))
+        assert client.get(f"/task/changes?since={expired}", headers=headers).status_code == 410
+        assert client.get("/task/changes?since=garbage", headers=headers).status_code == 400
+
+    def test_task_stats(self, client, auth_token):
+        from datetime import date, timedelta, timezone
+
+        stats = {
+            "total": 12,
+            "overdue": 2,
+            "due_today": 1,
+            "created_per_day": [{"day": date(2026, 10, 17), "count": 12}]
+        }
+        with patch("app.database.task.get_task_stats", new_callable=AsyncMock, return_value=stats) as mock_stats:
+            response = client.get("/task/stats?days=7", headers={"Authorization": f"Bearer {auth_token}"})
+
+        assert response.status_code == 200
+        assert response.json()["created_per_day"] == [{"day": "2026-10-17", "count": 12}]
+        today = datetime.now(timezone.utc).date()
+        assert mock_stats.await_args.kwargs["since"] == today - timedelta(days=6)
+
+
+@pytest.mark.asyncio
+async def test_count_user_tasks_served_from_counter(db_session):
+    from app.database.task import count_user_tasks
+
+    with patch("app.cache.task_counter.get_task_count", new_callable=AsyncMock, return_value=42):
+        assert await count_user_tasks(uuid4(), db_session) == 42
+    db_session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_count_user_tasks_primes_counter_on_miss(db_session):
+    from app.database.task import count_user_tasks
+
+    user_id = uuid4()
+    result = MagicMock()
+    result.scalar.return_value = 7
+    db_session.execute.return_value = result
+    with patch("app.cache.task_counter.get_task_count", new_callable=AsyncMock, return_value=None), \
+            patch("app.cache.task_counter.prime_task_count", new_callable=AsyncMock) as mock_prime:
+        assert await count_user_tasks(user_id, db_session) == 7
+    mock_prime.assert_awaited_once_with(user_id, 7)
+
+
+@pytest.mark.asyncio
+async def test_import_csv_handles_quoted_newlines():
+    from app.core.task_import import iter_records
+
+    async def chunks():
+        yield b'title,description\nFirst,"multi\n'
+        yield b'line"\nSecond,\n'
+
+    records = [item async for item in iter_records(chunks(), "csv")]
+
+    assert records == [
+        (2, {"title": "First", "description": "multi\nline"}),
+        (4, {"title": "Second", "description": None}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_remove_task_invalidates_cache(db_session):
+    from app.database.task import remove_task
+
+    user_id, task_id = uuid4(), uuid4()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = task_id
+    db_session.execute.return_value = result
+    with patch("app.cache.task_cache.invalidate_tasks", new_callable=AsyncMock) as mock_invalidate, \
+            patch("app.cache.task_counter.adjust_task_count", new_callable=AsyncMock) as mock_adjust, \
+            patch("app.cache.generation.bump_generation", new_callable=AsyncMock) as mock_bump:
+        assert await remove_task(task_id, user_id, db_session) is True
+
+    mock_invalidate.assert_awaited_once_with(user_id, [task_id])
+    mock_adjust.assert_awaited_once_with(user_id, -1)
+    mock_bump.assert_awaited_once_with("tasks", user_id)
+
+
+@pytest.mark.asyncio
+async def test_read_session_factory_keeps_recent_writers_on_primary():
+    import itertools
+    from app.database import database
+
+    replica = MagicMock()
+    user_id = uuid4()
+    assert await database.get_read_session_factory(user_id) is database.async_session_factory
+
+    with patch("app.database.database.replica_session_factories", [replica]), \
+            patch("app.database.database._replica_rotation", itertools.cycle([replica])), \
+            patch("app.cache.recent_writes.has_recent_write", new_callable=AsyncMock) as mock_recent:
+        mock_recent.return_value = False
+        assert await database.get_read_session_factory(user_id) is replica
+        mock_recent.return_value = True
+        assert await database.get_read_session_factory(user_id) is database.async_session_factory
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_records_acquire_timeouts():
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+    from sqlalchemy.util import greenlet_spawn
+    from app.database.pool import InstrumentedAsyncPool
+
+    pool = InstrumentedAsyncPool(creator=MagicMock, pool_size=1, max_overflow=0, timeout=0.01)
+    connection = await greenlet_spawn(pool.connect)
+    with pytest.raises(PoolTimeoutError):
+        await greenlet_spawn(pool.connect)
+
+    stats = pool.stats()
+    assert stats["checked_out"] == 1
+    assert stats["acquisitions"] == 1
+    assert stats["acquire_timeouts"] == 1
+    assert stats["waiting"] == 0
+    connection.close()
+    assert pool.stats()["checked_in"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_writer_coalesces_concurrent_submits():
+    import asyncio
+    from app.database.batch_writer import BatchWriter, BatchWriterFull
+
+    batches = []
+
+    async def handler(items):
+        batches.append(list(items))
+        return [ValueError("odd") if item % 2 else item * 10 for item in items]
+
+    writer = BatchWriter(handler, max_batch_size=3, max_wait=0.05, max_queue_size=10)
+    writer.start()
+    results = await asyncio.gather(
+        *(writer.submit(item) for item in range(4)), return_exceptions=True
+    )
+    await writer.stop()
+
+    assert batches == [[0, 1, 2], [3]]
+    assert results[0] == 0 and results[2] == 20
+    assert isinstance(results[1], ValueError) and isinstance(results[3], ValueError)
+
+    writer = BatchWriter(handler, max_queue_size=1)
+    writer.start()
+    accepted = asyncio.create_task(writer.submit(2))
+    rejected = asyncio.create_task(writer.submit(4))
+    with pytest.raises(BatchWriterFull):
+        await rejected
+    assert await accepted == 20
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_task_group_insert_isolates_failing_items():
+    from app.database.task import _insert_task_group
+    from app.schemas.task import TaskCreate
+
+    session = AsyncMock()
+    inserted = MagicMock()
+    inserted.scalar_one.return_value = uuid4()
+    session.execute.side_effect = [Exception("violates foreign key"), inserted, Exception("violates foreign key")]
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = session
+    items = [(TaskCreate(title="Kept"), uuid4()), (TaskCreate(title="Orphan"), uuid4())]
+
+    with patch("app.database.task.async_session_factory", factory), \
+            patch("app.database.task.after_tasks_written", new_callable=AsyncMock) as mock_written:
+        results = await _insert_task_group(items)
+
+    assert results[0] == inserted.scalar_one.return_value
+    assert isinstance(results[1], Exception)
+    mock_written.assert_awaited_once_with(items[0][1], created=[results[0]], due={})
+
+
+@pytest.mark.asyncio
+async def test_schema_revision_check():
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+    from app.database.schema import ALEMBIC_INI, check_schema_revision, SchemaOutOfDate
+
+    head = ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_current_head()
+
+    def engine_at(revision):
+        connection = AsyncMock()
+        connection.run_sync.return_value = revision
+        engine = MagicMock()
+        engine.connect.return_value.__aenter__.return_value = connection
+        return engine
+
+    assert await check_schema_revision(engine_at(head)) == head
+    # Migrated ahead by a rolling deploy: older code keeps starting
+    assert await check_schema_revision(engine_at("9999_from_the_future")) == "9999_from_the_future"
+    for behind in ("0001_baseline", None):
+        with pytest.raises(SchemaOutOfDate):
+            await check_schema_revision(engine_at(behind))
+
+
+@pytest.mark.asyncio
+async def test_task_events_publish_and_overflow(mock_redis):
+    import orjson
+    from app.cache import task_events
+
+    user_id, task_id = uuid4(), uuid4()
+    with patch("app.redis_client.redis_client", mock_redis):
+        await task_events.publish_task_events(user_id, deleted=[task_id])
+        await task_events.publish_task_events(user_id)
+
+    mock_redis.publish.assert_awaited_once_with(
+        f"tasks:events:{user_id}", orjson.dumps({"deleted": [str(task_id)]})
+    )
+
+    subscription = task_events.TaskEventSubscription(user_id, max_buffered=2)
+    for index in range(3):
+        subscription._push(f"event {index}")
+    assert await subscription.get(timeout=0.01) is task_events.RESYNC
+    assert await subscription.get(timeout=0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_task_event_streams_share_one_connection(mock_redis):
+    import asyncio
+    from app.cache import task_events
+
+    user_id, other_user_id = uuid4(), uuid4()
+    channel = f"tasks:events:{user_id}"
+    messages = asyncio.Queue()
+
+    async def get_message(**kwargs):
+        try:
+            message = await asyncio.wait_for(messages.get(), kwargs["timeout"])
+        except asyncio.TimeoutError:
+            return None
+        if isinstance(message, Exception):
+            raise message
+        return message
+
+    pubsub = AsyncMock()
+    pubsub.get_message.side_effect = get_message
+    mock_redis.pubsub = MagicMock(return_value=pubsub)
+    with patch("app.redis_client.redis_client", mock_redis), \
+            patch("app.cache.task_events._subscriber", task_events._SharedSubscriber()):
+        async with task_events.TaskEventSubscription(user_id) as first, \
+                task_events.TaskEventSubscription(user_id) as second, \
+                task_events.TaskEventSubscription(other_user_id) as other:
+            await messages.put({"type": "message", "channel": channel, "data": "event"})
+            assert await first.get(timeout=1) == "event"
+            assert await second.get(timeout=1) == "event"
+            assert await other.get(timeout=0.01) is None
+
+            await messages.put(ConnectionError("gone"))
+            assert await first.get(timeout=1) is task_events.CLOSED
+            assert await other.get(timeout=1) is task_events.CLOSED
+
+    mock_redis.pubsub.assert_called_once()
+    assert pubsub.subscribe.await_count == 2
+    pubsub.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_remove_tasks_leaves_tombstones(db_session):
+    from sqlalchemy.dialects import postgresql
+    from app.database.task import remove_tasks
+
+    user_id, task_id = uuid4(), uuid4()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [task_id]
+    db_session.execute.return_value = result
+    with patch("app.database.task.after_tasks_written", new_callable=AsyncMock):
+        await remove_tasks([task_id], user_id, db_session)
+
+    statement = str(db_session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert statement.startswith("WITH deleted AS \n(DELETE FROM task")
+    assert "INSERT INTO task_tombstone (task_id, user_fk)" in statement
+
+
+@pytest.mark.asyncio
+async def test_reminders_schedule_and_pop(mock_redis):
+    from datetime import timezone, timedelta
+    from app.cache import reminders
+
+    due = datetime.now(timezone.utc) + timedelta(days=1)
+    scheduled, cleared = uuid4(), uuid4()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    mock_redis.pipeline = MagicMock()
+    mock_redis.pipeline.return_value.__aenter__.return_value = pipe
+    mock_redis.eval.return_value = [str(scheduled), "1700000000.5"]
+    with patch("app.redis_client.redis_client", mock_redis):
+        await reminders.schedule_reminders({scheduled: due, cleared: None})
+        popped = await reminders.pop_due_reminders(datetime.now(timezone.utc), limit=10)
+
+    pipe.zadd.assert_called_once_with(
+        reminders.REMINDERS_KEY, {str(scheduled): (due - reminders.reminder_lead()).timestamp()}
+    )
+    pipe.zrem.assert_called_once_with(reminders.REMINDERS_KEY, str(cleared))
+    assert popped == [(scheduled, 1700000000.5)]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_due_reminders_mails_each_user_once():
+    from datetime import timezone
+    from app.core import celery_worker
+
+    popped = [(uuid4(), 1.0), (uuid4(), 2.0), (uuid4(), 3.0)]
+    due = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+    rows = [
+        MagicMock(email="a@example.com", username="a", title="First", appointed_at=due),
+        MagicMock(email="a@example.com", username="a", title="Second", appointed_at=due),
+    ]
+    with patch("app.core.celery_worker.async_session_factory", MagicMock()), \
+            patch.dict("os.environ", {"DEVELOPMENT_MODE": "false"}), \
+            patch("app.cache.reminders.pop_due_reminders", new_callable=AsyncMock, return_value=popped), \
+            patch("app.database.task.get_reminder_recipients", new_callable=AsyncMock, return_value=rows), \
+            patch("app.core.celery_worker._send_task_reminder", new_callable=AsyncMock,
+                  return_value=True) as mock_send:
+        result = await celery_worker._dispatch_due_reminders()
+
+    assert result == {"sent": 2, "dropped": 1}
+    mock_send.assert_awaited_once_with(
+        email="a@example.com", username="a", tasks=[("First", due), ("Second", due)]
+    )
+
+    rows[0].task_id, rows[1].task_id = popped[0][0], popped[1][0]
+    with patch("app.core.celery_worker.async_session_factory", MagicMock()), \
+            patch.dict("os.environ", {"DEVELOPMENT_MODE": "false"}), \
+            patch("app.cache.reminders.pop_due_reminders", new_callable=AsyncMock, return_value=popped), \
+            patch("app.database.task.get_reminder_recipients", new_callable=AsyncMock, return_value=rows), \
+            patch("app.core.celery_worker._send_task_reminder", new_callable=AsyncMock, return_value=False), \
+            patch("app.cache.reminders.restore_reminders", new_callable=AsyncMock) as mock_restore:
+        result = await celery_worker._dispatch_due_reminders()
+
+    assert result == {"sent": 0, "dropped": 1}
+    mock_restore.assert_awaited_once_with(popped[:2])
+
+    with patch("app.core.celery_worker.async_session_factory", MagicMock()), \
+            patch("app.cache.reminders.pop_due_reminders", new_callable=AsyncMock, return_value=popped), \
+            patch("app.database.task.get_reminder_recipients", new_callable=AsyncMock,
+                  side_effect=Exception("connection lost")), \
+            patch("app.cache.reminders.restore_reminders", new_callable=AsyncMock) as mock_restore:
+        with pytest.raises(Exception, match="connection lost"):
+            await celery_worker._dispatch_due_reminders()
+    mock_restore.assert_awaited_once_with(popped)
+
+
+def test_serialize_task_accepts_asyncpg_uuids():
+    import orjson
+    from asyncpg.pgproto.pgproto import UUID as PgUUID
+    from app.routers.task import _serialize_task
+
+    task = MagicMock()
+    task.task_id = PgUUID(str(uuid4()))
+    task.title, task.description = "Task", None
+    task.appointed_at, task.created_at = None, datetime(2026, 10, 18)
+
+    body = orjson.loads(orjson.dumps(_serialize_task(task)))
+
+    assert body["task_id"] == str(task.task_id)
+
+
+@pytest.mark.asyncio
+async def test_cached_task_only_served_under_its_etag(mock_redis):
+    from app.cache import task_cache
+
+    user_id, task_id = uuid4(), uuid4()
+    with patch("app.redis_client.redis_client", mock_redis):
+        await task_cache.cache_task(user_id, task_id, '"old"', '{"title":"Stale"}')
+        mock_redis.get.return_value = mock_redis.set.await_args.args[1]
+
+        assert await task_cache.get_cached_task(user_id, task_id, '"old"') == '{"title":"Stale"}'
+        assert await task_cache.get_cached_task(user_id, task_id, '"new"') is None
+
+
+def test_statement_caches_disabled_together():
+    from app.database import database
+
+    with patch.object(database.POSTGRESQL_CONFIG, "statement_cache_size", 0):
+        connect_args = database._connect_args()
+    name_func = connect_args.pop("prepared_statement_name_func")
+
+    assert connect_args == {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    assert name_func() != name_func()
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_overlong_lines():
+    from app.core import task_import
+
+    async def chunks():
+        yield b'{"title": "First"}\n{"title": "'
+        for _ in range(3):
+            yield b"x" * 40
+        yield b'"}\n{"title": "Last"}'
+
+    lines = [line async for line in task_import.iter_lines(chunks(), max_line_bytes=64)]
+
+    assert lines[0] == '{"title": "First"}'
+    assert isinstance(lines[1], ValueError)
+    assert lines[2] == '{"title": "Last"}'
+
+    with patch("app.core.task_import.MAX_LINE_BYTES", 64):
+        records = [item async for item in task_import.iter_records(chunks(), "ndjson")]
+    assert [line for line, _ in records] == [1, 2, 3]
+    assert str(records[1][1]) == "Line exceeds 64 bytes"
+
+
+@pytest.mark.asyncio
+async def test_task_event_subscriber_closes_when_idle(mock_redis):
+    from app.cache import task_events
+
+    pubsub = AsyncMock()
+    pubsub.get_message.return_value = None
+    mock_redis.pubsub = MagicMock(return_value=pubsub)
+    subscriber = task_events._SharedSubscriber()
+    with patch("app.redis_client.redis_client", mock_redis), \
+            patch("app.cache.task_events._subscriber", subscriber):
+        async with task_events.TaskEventSubscription(uuid4()):
+            reader = subscriber._reader
+        assert reader.cancelled()
+        assert subscriber._reader is None and subscriber._pubsub is None
+        pubsub.aclose.assert_awaited_once()
+        pubsub.unsubscribe.assert_not_awaited()
+
+        async with task_events.TaskEventSubscription(uuid4()):
+            assert subscriber._reader is not None and subscriber._reader is not reader
+    assert mock_redis.pubsub.call_count == 2
@@ -66,7 +66,10 @@ def test_upload_avatar_user_not_found(authed_client, image_file):
     ), patch(
         "app.database.user.add_avatar",
         new=AsyncMock(return_value=None),
-    ):
+    ), patch(
+        "app.external.avatar.delete_avatar",
+        new_callable=AsyncMock,
+    ) as mock_delete:
         response = authed_client.post(
             "/user/avatar",
             files={"file": ("test.jpg", image_file, "image/jpeg")},
@@ -74,6 +77,8 @@ def test_upload_avatar_user_not_found(authed_client, image_file):
 
     assert response.status_code == 404
     assert "User not found" in response.json()["detail"]
+    # The object uploaded for an account deleted meanwhile is not left behind
+    mock_delete.assert_awaited_once()
 
 
 def test_delete_avatar_success(authed_client):
@@ -169,3 +174,17 @@ def test_delete_avatar_s3_error(authed_client):
 
     assert response.status_code == 500
     assert "Internal server error" in response.json()["detail"]
+
+
+def test_get_avatar_not_modified(authed_client):
+    with patch("app.cache.generation.get_generation", new=AsyncMock(return_value="3")), \
+         patch("app.database.user.get_avatar", new=AsyncMock(return_value="avatars/test.jpg")) as mock_get:
+        response = authed_client.get("/user/avatar")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+
+        response = authed_client.get("/user/avatar", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    mock_get.assert_awaited_once()
@@ -103,7 +103,9 @@ def test_signup_auth(client):
         "email": "test@example.com",
         "password": "12345"
     }
-    signup_response = client.post("/user/signup", json=signup_data)
+    # A taken email or username makes create_user return None
+    with patch("app.database.user.create_user", new_callable=AsyncMock, return_value=None):
+        signup_response = client.post("/user/signup", json=signup_data)
     assert signup_response.status_code == 400
 
 
@@ -133,3 +135,123 @@ def test_login_with_empty_email(client):
     }
     response = client.post("/user/login", json=login_data)
     assert response.status_code == 422  # Validation error
+
+
+def test_login_rejected_while_hasher_saturated(client, db_session):
+    from unittest.mock import MagicMock
+    from app.utils.password_manager import PasswordHasherBusy
+
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = MagicMock(password="hashed_pw")
+    db_session.execute.return_value = result
+    with patch("app.database.user.verify_password_async", new_callable=AsyncMock,
+               side_effect=PasswordHasherBusy("full")):
+        response = client.post("/user/login", json={"email": TEST_EMAIL, "password": TEST_PASS})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_create_user_conflict_is_single_statement(db_session):
+    from unittest.mock import MagicMock
+    from app.database.user import create_user
+    from app.schemas.user import UserSignup
+
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = None    # ON CONFLICT DO NOTHING returned no row
+    db_session.execute.return_value = result
+
+    user = await create_user(
+        UserSignup(username="taken_user", email="taken@example.com", password="password123"),
+        db_session
+    )
+
+    assert user is None
+    db_session.execute.assert_awaited_once()
+
+
+def test_delete_account_schedules_purge(authed_client):
+    from unittest.mock import MagicMock
+
+    deleted_user = MagicMock()
+    deleted_user.user_id = uuid.uuid4()
+    with patch("app.database.user.mark_user_deleted", new_callable=AsyncMock, return_value=deleted_user), \
+            patch("app.routers.user.purge_deleted_user") as mock_purge:
+        response = authed_client.delete("/user/")
+
+    assert response.status_code == 202
+    mock_purge.delay.assert_called_once_with(str(deleted_user.user_id))
+
+    with patch("app.database.user.mark_user_deleted", new_callable=AsyncMock, return_value=None), \
+            patch("app.routers.user.purge_deleted_user") as mock_purge:
+        response = authed_client.delete("/user/")
+
+    assert response.status_code == 404
+    mock_purge.delay.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_purge_deleted_user_deletes_tasks_in_chunks():
+    from unittest.mock import MagicMock
+    from app.core import celery_worker
+
+    user = MagicMock()
+    user.user_id = uuid.uuid4()
+    user.avatar_url = "avatars/user"
+    with patch("app.core.celery_worker.async_session_factory", MagicMock()), \
+            patch("app.database.user.find_deleted_user", new_callable=AsyncMock, return_value=user), \
+            patch("app.database.task.purge_user_tasks_chunk", new_callable=AsyncMock) as mock_chunk, \
+            patch("app.external.avatar.delete_avatar", new_callable=AsyncMock) as mock_avatar, \
+            patch("app.database.user.remove_deleted_user", new_callable=AsyncMock) as mock_remove, \
+            patch("app.cache.task_counter.drop_task_count", new_callable=AsyncMock) as mock_drop:
+        mock_chunk.side_effect = [celery_worker.PURGE_CHUNK_SIZE, celery_worker.PURGE_CHUNK_SIZE, 7]
+        result = await celery_worker._purge_deleted_user(user.user_id)
+
+    assert result["tasks"] == 2 * celery_worker.PURGE_CHUNK_SIZE + 7
+    assert mock_chunk.await_count == 3
+    mock_avatar.assert_awaited_once_with(user_id=user.user_id)
+    mock_remove.assert_awaited_once()
+    mock_drop.assert_awaited_once_with(user.user_id)
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_beyond_queue():
+    import asyncio
+    import threading
+    from app.utils.password_manager import PasswordHasher, PasswordHasherBusy
+
+    hasher = PasswordHasher(workers=1, max_queue_size=1)
+    release = threading.Event()
+    running = asyncio.ensure_future(hasher.run(release.wait, 5))
+    queued = asyncio.ensure_future(hasher.run(lambda: "queued"))
+    await asyncio.sleep(0.05)
+
+    assert hasher.stats()["running"] == 1 and hasher.stats()["queued"] == 1
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.run(lambda: "rejected")
+
+    release.set()
+    assert await running is True
+    assert await queued == "queued"
+    await asyncio.sleep(0.01)
+    stats = hasher.stats()
+    assert (stats["completed"], stats["rejected"], stats["queued"]) == (2, 1, 0)
+    assert stats["wait_max_ms"] >= 50
+
+
+def test_deleted_account_token_is_revoked(client, mock_redis):
+    from unittest.mock import MagicMock
+    from app.utils.jwt_manager import create_access_token
+
+    user = MagicMock()
+    user.user_id = uuid.uuid4()
+    headers = {"Authorization": f"Bearer {create_access_token(user_id=user.user_id)}"}
+    with patch("app.database.user._update_user", new_callable=AsyncMock, return_value=user), \
+            patch("app.core.celery_worker.purge_deleted_user.delay"):
+        assert client.delete("/user/", headers=headers).status_code == 202
+
+    revoked_key, _ = mock_redis.set.await_args.args
+    assert revoked_key == f"revoked_user:{user.user_id}"
+    mock_redis.exists.return_value = 1
+    assert client.get("/task/", headers=headers).status_code == 401
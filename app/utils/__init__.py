@@ -1,9 +1,17 @@
 from .password_manager import (
     hash_password,
-    verify_password
+    verify_password,
+    hash_password_async,
+    verify_password_async,
+    PasswordHasherBusy
 )
 from .jwt_manager import (
     create_access_token,
     verify_access_token
 )
 from .oauth2Schema import oauth2_schema
+from .etag import (
+    make_etag,
+    etag_matches,
+    not_modified
+)
@@ -0,0 +1,27 @@
+import base64
+import json
+from typing import Any, List
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Packs keyset pagination values into an opaque url-safe token.
+    Values must be JSON serializable (convert datetimes/UUIDs to str first).
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Unpacks a token produced by encode_cursor.
+    Raises ValueError if the token is malformed or holds a wrong number of values.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except ValueError as error:
+        raise ValueError(f"Malformed cursor: {error}") from error
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Malformed cursor")
+    return values
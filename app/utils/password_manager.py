@@ -1,4 +1,9 @@
+from app.config.config import PASSWORD_HASH_CONFIG
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Tuple    # noqa: TYP001
+import asyncio
 import bcrypt
+import time
 
 
 def hash_password(password: str) -> str:
@@ -15,3 +20,81 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return bcrypt.checkpw(password_byte_enc, hashed_byte_enc)
     except Exception:
         return False
+
+
+class PasswordHasherBusy(Exception):
+    """Every worker is busy and the queue is full, the caller should answer 503."""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop on `workers` threads (bcrypt releases the
+    GIL, so they hash in parallel). At most `max_queue_size` calls wait for
+    a thread; beyond that run() fails at once instead of letting a login
+    burst queue up requests for seconds. Counters are only touched on the
+    event loop thread.
+    """
+
+    def __init__(self, workers: int, max_queue_size: int):
+        self._workers = workers
+        self._max_queue_size = max_queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @staticmethod
+    def _timed(function: Callable, args: tuple, submitted: float) -> Tuple[float, Any]:
+        return time.perf_counter() - submitted, function(*args)
+
+    def _finished(self, future: Future) -> None:
+        self._pending -= 1
+        if future.cancelled() or future.exception() is not None:
+            return
+        waited = future.result()[0]
+        self._completed += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+
+    async def run(self, function: Callable, *args) -> Any:
+        """Result of `function(*args)` on a pool thread, raises PasswordHasherBusy when saturated."""
+        if self._pending >= self._workers + self._max_queue_size:
+            self._rejected += 1
+            raise PasswordHasherBusy("password hashing queue is full")
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(self._timed, function, args, time.perf_counter())
+        self._pending += 1
+        # Released when the thread is done, not when the caller stops waiting
+        future.add_done_callback(lambda done: loop.call_soon_threadsafe(self._finished, done))
+        _, result = await asyncio.wrap_future(future)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "workers": self._workers,
+            "max_queue_size": self._max_queue_size,
+            "running": min(self._pending, self._workers),
+            "queued": max(self._pending - self._workers, 0),
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "wait_avg_ms": round(
+                self._wait_total / self._completed * 1000, 3
+            ) if self._completed else 0.0,
+            "wait_max_ms": round(self._wait_max * 1000, 3)
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=PASSWORD_HASH_CONFIG.workers,
+    max_queue_size=PASSWORD_HASH_CONFIG.max_queue_size
+)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
@@ -1,5 +1,6 @@
 from app.config.config import SMTPCONFIG
 import asyncio
+from html import escape
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
 
 from loguru import logger
@@ -35,3 +36,31 @@ async def _send_code_verification(email: str, code: str):
     except Exception as error:
         logger.error(f"Error during email sending: {error}")
         return
+
+
+async def _send_task_reminder(email: str, username: str, tasks: list) -> bool:
+    """
+    One email per user and run, `tasks` holds (title, appointed_at) pairs.
+    Returns whether the email went out, so the reminders can be retried.
+    """
+    try:
+        items = "".join(
+            f"<li><b>{escape(title)}</b> at {appointed_at:%Y-%m-%d %H:%M} UTC</li>"
+            for title, appointed_at in tasks
+        )
+        html = f"""
+        <h1>Hi {escape(username)}, some of your tasks are due soon.</h1>
+        <ul>{items}</ul>
+        """
+        message = MessageSchema(
+            recipients=[email],
+            subject="Upcoming tasks in Zettelkasten App",
+            body=html,
+            subtype=MessageType.html
+        )
+        fm = FastMail(config=conf)
+        await fm.send_message(message=message)
+        return True
+    except Exception as error:
+        logger.error(f"Error during email sending: {error}")
+        return False
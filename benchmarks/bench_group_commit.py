@@ -0,0 +1,96 @@
+"""
+Per-request commits against the group-commit task writer.
+
+    python -m benchmarks.bench_group_commit [--tasks 2000] [--concurrency 50]
+
+Needs the same environment as the app (.env, a reachable Postgres and Redis).
+A throwaway user is created for the run and deleted afterwards together with
+its tasks. Each mode runs `--tasks` POST /task inserts with `--concurrency`
+of them in flight, through task_db.create_task exactly as the endpoint does.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from uuid import uuid4
+
+from sqlalchemy import delete, insert
+
+from app.database import database
+from app.database import task as task_db
+from app.models.models import User
+from app.schemas.task import TaskCreate
+
+
+async def _create_user() -> str:
+    user_id = uuid4()
+    async with database.async_session_factory() as session:
+        await session.execute(
+            insert(User).values(
+                user_id=user_id,
+                username=f"bench-{user_id.hex[:12]}",
+                email=f"bench-{user_id.hex}@example.com",
+                password="-"
+            )
+        )
+        await session.commit()
+    return user_id
+
+
+async def _drop_user(user_id) -> None:
+    async with database.async_session_factory() as session:
+        await session.execute(delete(User).where(User.user_id == user_id))
+        await session.commit()
+
+
+async def _run(user_id, tasks: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            async with database.async_session_factory() as session:
+                task_id = await task_db.create_task(
+                    TaskCreate(title=f"Benchmark task {index}"), user_id, session
+                )
+            latencies.append(time.perf_counter() - started)
+            if task_id is None:
+                raise RuntimeError("task insert failed")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(tasks)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "tasks/s": tasks / elapsed,
+        "p50 ms": statistics.median(latencies) * 1000,
+        "p99 ms": latencies[int(len(latencies) * 0.99) - 1] * 1000
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    user_id = await _create_user()
+    try:
+        await database.warm_up_engines()
+        direct = await _run(user_id, args.tasks, args.concurrency)
+        task_db.task_writer.start()
+        try:
+            grouped = await _run(user_id, args.tasks, args.concurrency)
+        finally:
+            await task_db.task_writer.stop()
+    finally:
+        await _drop_user(user_id)
+        await database.dispose_engines()
+
+    for name, result in (("per-request commit", direct), ("group commit", grouped)):
+        print(f"{name:<19} " + "  ".join(f"{key} {value:8.1f}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
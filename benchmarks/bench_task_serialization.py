@@ -0,0 +1,105 @@
+"""
+Per-page serialization cost of the task list endpoint.
+
+    python -m benchmarks.bench_task_serialization [--pages 2000]
+
+Compares the former stdlib path (str()/isoformat() per field + JSONResponse),
+the orjson path used by the routers (native UUID/datetime + ORJSONResponse)
+and pydantic-core (TypeAdapter(list[TaskResponse]).dump_json).
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+from app.schemas.responses import TaskResponse
+
+PAGE_SIZES = (10, 100)
+
+
+def _make_tasks(count: int) -> list:
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            task_id=uuid4(),
+            title=f"Task number {index}",
+            description="Lorem ipsum dolor sit amet " * 20,
+            appointed_at=now + timedelta(days=index) if index % 2 else None,
+            created_at=now
+        )
+        for index in range(count)
+    ]
+
+
+def _pagination(size: int) -> dict:
+    return {"total_pages": 10, "current_page": 1, "page_size": size, "has_next": True, "has_prev": False}
+
+
+def stdlib_page(tasks: list) -> bytes:
+    return JSONResponse({
+        "tasks": [
+            {
+                "task_id": str(task.task_id),
+                "title": task.title,
+                "description": task.description,
+                "appointed_at": task.appointed_at.isoformat() if task.appointed_at else None,
+                "created_at": task.created_at.isoformat()
+            }
+            for task in tasks
+        ],
+        "pagination": _pagination(len(tasks))
+    }).body
+
+
+def orjson_page(tasks: list) -> bytes:
+    return ORJSONResponse({
+        "tasks": [
+            {
+                "task_id": task.task_id,
+                "title": task.title,
+                "description": task.description,
+                "appointed_at": task.appointed_at,
+                "created_at": task.created_at
+            }
+            for task in tasks
+        ],
+        "pagination": _pagination(len(tasks))
+    }).body
+
+
+_TASKS_ADAPTER = TypeAdapter(list[TaskResponse])
+
+
+def pydantic_page(tasks: list) -> bytes:
+    validated = [TaskResponse.model_validate(task, from_attributes=True) for task in tasks]
+    return _TASKS_ADAPTER.dump_json(validated)
+
+
+def _measure(serializer, tasks: list, pages: int) -> float:
+    serializer(tasks)
+    start = time.perf_counter()
+    for _ in range(pages):
+        serializer(tasks)
+    return (time.perf_counter() - start) / pages * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+    for size in PAGE_SIZES:
+        tasks = _make_tasks(size)
+        baseline = _measure(stdlib_page, tasks, args.pages)
+        print(f"page size {size}:")
+        for name, serializer in (("stdlib", stdlib_page), ("orjson", orjson_page), ("pydantic", pydantic_page)):
+            cost = baseline if serializer is stdlib_page else _measure(serializer, tasks, args.pages)
+            print(f"  {name:<9} {cost:9.1f} us/page  x{baseline / cost:.2f}")
+
+
+if __name__ == "__main__":
+    main()